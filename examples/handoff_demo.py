@@ -7,6 +7,7 @@ to delegate complex tasks to specialized agents.
 import asyncio
 import sys
 from pathlib import Path
+from typing import Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -19,6 +20,43 @@ from agent_modules.orchestrator import create_orchestrator_agent
 from agent_modules.handoffs import HandoffRequest, create_handoff_coordinator
 from models.context import PlanningContext, EntityContext, UserPreferences
 from agents import SQLiteSession, Runner
+from openai.types.responses import ResponseTextDeltaEvent
+
+
+# Phrases for the pattern recognition demo, grouped by expected category.
+# Built once at import rather than on every demo run.
+FROZEN_PATTERNS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("Calendar Operations", (
+        "book a meeting",
+        "check my availability", 
+        "schedule appointment",
+        "what's on my calendar"
+    )),
+    ("Task Management", (
+        "create a task",
+        "mark as complete",
+        "set priority",
+        "add to project"
+    )),
+    ("Email Processing", (
+        "check emails",
+        "send message",
+        "extract action items",
+        "reply to sender"
+    )),
+    ("Smart Planning", (
+        "optimize my schedule",
+        "analyze workload",
+        "find best time",
+        "balance my tasks"
+    )),
+    ("NLP Processing", (
+        "extract dates from text",
+        "parse this sentence",
+        "understand intent",
+        "identify entities"
+    )),
+)
 
 
 async def demo_basic_handoffs():
@@ -39,16 +77,16 @@ async def demo_basic_handoffs():
         "Parse this text: 'Meeting with client next Tuesday at 3pm in downtown office'"
     ]
     
+    # Create mock context once; analyze_handoff_need only reads it
+    context = PlanningContext(
+        session_id="demo_session",
+        user_preferences=UserPreferences(),
+        entities=EntityContext()
+    )
+    
     for request in test_requests:
         print(f"\n📝 Request: {request}")
         
-        # Create mock context
-        context = PlanningContext(
-            session_id="demo_session",
-            user_preferences=UserPreferences(),
-            entities=EntityContext()
-        )
-        
         # Analyze handoff need
         handoff_request = coordinator.analyze_handoff_need(context, request)
         
@@ -72,6 +110,26 @@ async def demo_basic_handoffs():
         print(f"{key}: {value}")
 
 
+async def _consume_events(result) -> Tuple[str, int]:
+    """Print handoff and tool events from a streamed run"""
+    response_text = ""
+    handoff_count = 0
+    
+    # Monitor stream for handoffs
+    async for event in result.stream_events():
+        if event.type == "raw_response_event":
+            if isinstance(event.data, ResponseTextDeltaEvent):
+                response_text += event.data.delta
+        elif event.type == "agent_updated_stream_event":
+            handoff_count += 1
+            print(f"🔄 Handoff #{handoff_count}: → {event.new_agent.name}")
+        elif event.type == "run_item_stream_event":
+            if event.item.type == "tool_call_item":
+                print(f"🔧 Tool Call: {event.item.name}")
+    
+    return response_text, handoff_count
+
+
 async def demo_full_conversation_handoffs():
     """Demonstrate handoffs in a full conversation"""
     print("\n🗣️  Testing Full Conversation with Handoffs")
@@ -108,23 +166,13 @@ async def demo_full_conversation_handoffs():
             max_turns=10
         )
         
-        response_text = ""
-        handoff_count = 0
-        
-        # Monitor stream for handoffs
-        async for event in result.stream_events():
-            if event.type == "agent_updated_stream_event":
-                handoff_count += 1
-                print(f"🔄 Handoff #{handoff_count}: → {event.new_agent.name}")
-            elif event.type == "run_item_stream_event":
-                if event.item.type == "tool_call_item":
-                    print(f"🔧 Tool Call: {event.item.name}")
+        response_text, handoff_count = await _consume_events(result)
         
-        # Wait for completion
-        final_result = await result
+        # The stream is drained, so the final output is available
+        final_output = result.final_output
         print(f"\n✅ Conversation completed")
         print(f"🔄 Total handoffs: {handoff_count}")
-        print(f"📄 Final response length: {len(str(final_result.final_output))} characters")
+        print(f"📄 Final response length: {len(str(final_output or response_text))} characters")
         
     except Exception as e:
         print(f"❌ Error in conversation demo: {str(e)}")
@@ -138,56 +186,36 @@ async def demo_handoff_patterns():
     config = Config()
     coordinator = create_handoff_coordinator(config)
     
-    # Test pattern recognition
-    patterns = {
-        "Calendar Operations": [
-            "book a meeting",
-            "check my availability", 
-            "schedule appointment",
-            "what's on my calendar"
-        ],
-        "Task Management": [
-            "create a task",
-            "mark as complete",
-            "set priority",
-            "add to project"
-        ],
-        "Email Processing": [
-            "check emails",
-            "send message",
-            "extract action items",
-            "reply to sender"
-        ],
-        "Smart Planning": [
-            "optimize my schedule",
-            "analyze workload",
-            "find best time",
-            "balance my tasks"
-        ],
-        "NLP Processing": [
-            "extract dates from text",
-            "parse this sentence",
-            "understand intent",
-            "identify entities"
-        ]
-    }
-    
     context = PlanningContext(
         session_id="pattern_demo",
         user_preferences=UserPreferences(),
         entities=EntityContext()
     )
     
-    for category, requests in patterns.items():
-        print(f"\n📂 {category}")
-        print("-" * 20)
+    # Collect output and write it once at the end instead of per line
+    lines = []
+    
+    for category, requests in FROZEN_PATTERNS:
+        lines.append(f"\n📂 {category}")
+        lines.append("-" * 20)
         
-        for request in requests:
-            handoff_request = coordinator.analyze_handoff_need(context, request)
-            if handoff_request:
-                print(f"✓ '{request}' → {handoff_request.target_agent}")
+        # Requests within a category are independent, so analyze them concurrently
+        tasks = [
+            asyncio.to_thread(coordinator.analyze_handoff_need, context, request)
+            for request in requests
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for request, handoff_request in zip(requests, results):
+            if isinstance(handoff_request, Exception):
+                lines.append(f"❌ '{request}' → error: {handoff_request}")
+            elif handoff_request:
+                lines.append(f"✓ '{request}' → {handoff_request.target_agent}")
             else:
-                print(f"⚪ '{request}' → orchestrator")
+                lines.append(f"⚪ '{request}' → orchestrator")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 async def main():
@@ -209,4 +237,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
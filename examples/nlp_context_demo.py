@@ -39,13 +39,13 @@ async def demo_basic_context_management():
     
     print("\n🔍 Processing with context management...")
     
-    for i, message in enumerate(conversation):
+    # Parse the whole conversation in one batch; context still builds turn by turn
+    turns = context_manager.process_turns(conversation)
+    
+    for i, (message, turn) in enumerate(zip(conversation, turns)):
         print(f"\n--- Turn {i+1} ---")
         print(f"Input: {message}")
         
-        # Process turn
-        turn = context_manager.process_turn(message)
-        
         print(f"Intent: {turn.intent} (confidence: {turn.intent_confidence:.2f})")
         print(f"Entities: {[(e.text, e.label) for e in turn.entities]}")
         
@@ -77,16 +77,22 @@ async def demo_entity_coreference_resolution():
         "Make sure the Marketing team lead gets the updates"  # Role-based reference
     ]
     
+    # Collect output and write it once at the end instead of per line
+    lines = []
+    
     for i, message in enumerate(messages):
-        print(f"\nTurn {i+1}: {message}")
+        lines.append(f"\nTurn {i+1}: {message}")
         turn = context_manager.process_turn(message)
         
         # Show entity resolution
         for entity in turn.entities:
             if entity.label == "PERSON":
-                print(f"  Entity: '{entity.text}' → Canonical ID: {entity.canonical_id}")
+                lines.append(f"  Entity: '{entity.text}' → Canonical ID: {entity.canonical_id}")
                 if entity.aliases:
-                    print(f"  Aliases: {list(entity.aliases)}")
+                    lines.append(f"  Aliases: {list(entity.aliases)}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
     
     # Show entity context
     print(f"\n🔍 Entity Analysis:")
@@ -222,12 +228,12 @@ async def demo_real_conversation_simulation():
     print("📱 Planning Assistant Conversation:")
     print("-" * 40)
     
-    for i, message in enumerate(realistic_conversation, 1):
+    # Process with context, parsing all messages in one batch
+    turns = context_manager.process_turns(realistic_conversation)
+    
+    for i, (message, turn) in enumerate(zip(realistic_conversation, turns), 1):
         print(f"\n👤 User ({i}): {message}")
         
-        # Process with context
-        turn = context_manager.process_turn(message)
-        
         # Show system understanding
         print(f"🤖 System Understanding:")
         print(f"   Intent: {turn.intent} ({turn.intent_confidence:.1%} confidence)")
@@ -290,4 +296,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
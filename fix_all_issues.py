@@ -5,9 +5,57 @@ Run this script from the planner-agent directory
 """
 
 import os
+import re
 import sys
 from pathlib import Path
 
+
+# Final ``else`` of the operation dispatch, located after the delete branch
+TODOIST_ELSE_BRANCH = re.compile(
+    r'(elif operation == "delete":.*?\n)([ \t]*)(else:[ \t]*\n[^\n]*Unknown operation)',
+    re.DOTALL
+)
+
+# Marker the list_projects_json helper is inserted before
+TODOIST_STRUCTURED_MARKER = re.compile(r'^# Structured interface implementations', re.MULTILINE)
+
+LIST_PROJECTS_FUNC = '''
+async def list_projects_json() -> str:
+    """List all projects (JSON interface)"""
+    try:
+        if not _todoist_api:
+            # Return mock data when API not available
+            return json.dumps({
+                "status": "success",
+                "projects": [
+                    {"id": "proj_1", "name": "Work", "color": "blue"},
+                    {"id": "proj_2", "name": "Personal", "color": "green"}
+                ],
+                "total": 2
+            }, indent=2)
+            
+        projects = _todoist_api.get_projects()
+        project_list = []
+        for project in projects:
+            project_list.append({
+                "id": project.id,
+                "name": project.name,
+                "color": project.color,
+                "parent_id": project.parent_id,
+                "is_favorite": project.is_favorite
+            })
+        
+        return json.dumps({
+            "status": "success",
+            "projects": project_list,
+            "total": len(project_list)
+        }, indent=2)
+    except Exception as e:
+        return ToolError(message=f"Failed to list projects: {str(e)}").model_dump_json(indent=2)
+
+
+'''
+
 def fix_calendar_model():
     """Fix the CalendarResponse model Dict import issue"""
     print("Fixing CalendarResponse model...")
@@ -51,76 +99,35 @@ def fix_todoist_tool():
     
     # Read the file
     with open(todoist_tool_path, 'r') as f:
-        lines = f.readlines()
+        content = f.read()
     
-    # Find where to add the list_projects handling
-    # Look for the manage_tasks_json function
-    insert_index = None
-    for i, line in enumerate(lines):
-        if 'elif operation == "delete":' in line:
-            # Find the end of the delete block to add list_projects before the else
-            for j in range(i, len(lines)):
-                if 'else:' in lines[j] and 'Unknown operation' in lines[j+1]:
-                    insert_index = j
-                    break
-            break
+    # Skip if a previous run already added the operation
+    if 'elif operation == "list_projects":' in content:
+        print("⚠️ list_projects operation already present, may already be fixed")
+        return False
     
-    if insert_index:
-        # Add list_projects handling
-        new_code = '''
-        elif operation == "list_projects":
-            return await list_projects_json()
-
-'''
-        lines.insert(insert_index, new_code)
-        
-        # Now add the list_projects_json function at the end before the structured implementations
-        # Find where to add it
-        for i, line in enumerate(lines):
-            if '# Structured interface implementations' in line:
-                # Add the function before this comment
-                project_func = '''
-async def list_projects_json() -> str:
-    """List all projects (JSON interface)"""
-    try:
-        if not _todoist_api:
-            # Return mock data when API not available
-            return json.dumps({
-                "status": "success",
-                "projects": [
-                    {"id": "proj_1", "name": "Work", "color": "blue"},
-                    {"id": "proj_2", "name": "Personal", "color": "green"}
-                ],
-                "total": 2
-            }, indent=2)
-            
-        projects = _todoist_api.get_projects()
-        project_list = []
-        for project in projects:
-            project_list.append({
-                "id": project.id,
-                "name": project.name,
-                "color": project.color,
-                "parent_id": project.parent_id,
-                "is_favorite": project.is_favorite
-            })
-        
-        return json.dumps({
-            "status": "success",
-            "projects": project_list,
-            "total": len(project_list)
-        }, indent=2)
-    except Exception as e:
-        return ToolError(message=f"Failed to list projects: {str(e)}").model_dump_json(indent=2)
-
-
-'''
-                lines.insert(i, project_func)
-                break
+    # Add list_projects handling before the final else of the dispatch
+    def add_branch(match):
+        indent = match.group(2)
+        return (
+            f'{match.group(1)}'
+            f'{indent}elif operation == "list_projects":\n'
+            f'{indent}    return await list_projects_json()\n\n'
+            f'{indent}{match.group(3)}'
+        )
+    
+    content, branch_count = TODOIST_ELSE_BRANCH.subn(add_branch, content, count=1)
+    
+    if branch_count:
+        # Add the list_projects_json function before the structured implementations
+        if 'async def list_projects_json(' not in content:
+            content = TODOIST_STRUCTURED_MARKER.sub(
+                lambda match: LIST_PROJECTS_FUNC + match.group(0), content, count=1
+            )
         
         # Write back
         with open(todoist_tool_path, 'w') as f:
-            f.writelines(lines)
+            f.write(content)
         print("✓ Added list_projects operation to Todoist tool")
         return True
     else:
@@ -193,33 +200,15 @@ def fix_tool_call_item():
     
     # Read the file
     with open(interface_path, 'r') as f:
-        lines = f.readlines()
-    
-    # Find and fix the tool name extraction logic
-    found = False
-    for i, line in enumerate(lines):
-        if 'if event.item.type == "tool_call_item":' in line:
-            # Replace the tool name extraction logic with safer version
-            # Find the block end
-            start_index = i + 1
-            end_index = start_index
-            
-            # Find where this block ends (next elif or similar)
-            for j in range(start_index, min(start_index + 30, len(lines))):
-                if 'elif event.item.type' in lines[j] or 'elif event.type' in lines[j]:
-                    end_index = j
-                    break
-            
-            # The fix is already in place with the safe attribute checking
-            # Just verify it's working correctly
-            found = True
-            print("✓ ToolCallItem handling already has safe attribute access")
-            break
+        content = f.read()
     
-    if not found:
+    # The fix is already in place with the safe attribute checking
+    # Just verify the handling code is present
+    if '_tool_call_name(event.item.raw_item)' not in content:
         print("⚠️ Could not find ToolCallItem handling code")
         return False
     
+    print("✓ ToolCallItem handling already has safe attribute access")
     return True
 
 
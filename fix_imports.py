@@ -2,65 +2,86 @@
 """
 Fix all incorrect imports in the project
 """
+import mmap
 import os
 import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
+# Import rewrites applied to every file, compiled once at import. Each carries
+# a literal every match must contain, so patterns that cannot apply are skipped.
+IMPORT_REPLACEMENTS = [
+    (probe, re.compile(pattern), replacement)
+    for probe, pattern, replacement in [
+        # Fix agent_modules references in non-agent_modules files
+        ('from agent_modules.', r'from agent_modules\.([a-z_]+) import', r'from \1 import'),
+        # Fix relative imports for models
+        ('from ..models import', r'from \.\.models import', r'from models import'),
+        ('from ..tools import', r'from \.\.tools import', r'from tools import'),
+        ('from ..guardrails import', r'from \.\.guardrails import', r'from guardrails import'),
+        ('from ..monitoring import', r'from \.\.monitoring import', r'from monitoring import'),
+        ('from ..nlp import', r'from \.\.nlp import', r'from nlp import'),
+        ('from ..integrations import', r'from \.\.integrations import', r'from integrations import'),
+        # Fix single dot imports
+        ('from .', r'from \.([a-z_]+) import', r'from \1 import'),
+    ]
+]
+
+# Within agent_modules, use relative imports
+AGENT_MODULES_IMPORT = re.compile(r'from agent_modules\.')
+
+# Files larger than this are probed through mmap before being read
+MMAP_THRESHOLD = 64 * 1024
+
+# Literal rewrites for package __init__.py files, keyed by package name
+INIT_REWRITES = {
+    'models': [
+        ('from agent_modules.task import', 'from .task import'),
+        ('from agent_modules.event import', 'from .event import'),
+        ('from agent_modules.context import', 'from .context import'),
+    ],
+    'tools': [('from tools.', 'from .')],
+    'monitoring': [('from monitoring.', 'from .')],
+    'guardrails': [('from guardrails.', 'from .')],
+    'nlp': [('from nlp.', 'from .')],
+    'integrations': [('from integrations.', 'from .')],
+}
+
 def fix_imports_in_file(filepath):
     """Fix imports in a single file"""
+    size = os.path.getsize(filepath)
+    
+    # Probe large files in place and only read them when a rewrite could apply
+    if size > MMAP_THRESHOLD:
+        with open(filepath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped.find(b'from ') == -1:
+                    return False
+    
     with open(filepath, 'r') as f:
         content = f.read()
     
+    # Every rewrite targets a ``from`` import, so skip files without one
+    if 'from ' not in content:
+        return False
+    
     original_content = content
     
     # Fix specific patterns
-    replacements = [
-        # Fix agent_modules references in non-agent_modules files
-        (r'from agent_modules\.([a-z_]+) import', r'from \1 import'),
-        # Fix relative imports for models
-        (r'from \.\.models import', r'from models import'),
-        (r'from \.\.tools import', r'from tools import'),
-        (r'from \.\.guardrails import', r'from guardrails import'),
-        (r'from \.\.monitoring import', r'from monitoring import'),
-        (r'from \.\.nlp import', r'from nlp import'),
-        (r'from \.\.integrations import', r'from integrations import'),
-        # Fix single dot imports
-        (r'from \.([a-z_]+) import', r'from \1 import'),
-    ]
-    
-    for pattern, replacement in replacements:
-        content = re.sub(pattern, replacement, content)
+    for probe, pattern, replacement in IMPORT_REPLACEMENTS:
+        if probe in content:
+            content = pattern.sub(replacement, content)
     
     # Special case for agent_modules internal imports
     if 'agent_modules' in str(filepath):
         # Within agent_modules, use relative imports
-        content = re.sub(r'from agent_modules\.', r'from .', content)
-    
-    # Special case for models/__init__.py
-    if str(filepath).endswith('models/__init__.py'):
-        content = content.replace('from agent_modules.task import', 'from .task import')
-        content = content.replace('from agent_modules.event import', 'from .event import')
-        content = content.replace('from agent_modules.context import', 'from .context import')
+        content = AGENT_MODULES_IMPORT.sub(r'from .', content)
     
-    # Special case for tools/__init__.py
-    if str(filepath).endswith('tools/__init__.py'):
-        content = content.replace('from tools.', 'from .')
-    
-    # Special case for monitoring/__init__.py
-    if str(filepath).endswith('monitoring/__init__.py'):
-        content = content.replace('from monitoring.', 'from .')
-    
-    # Special case for guardrails/__init__.py
-    if str(filepath).endswith('guardrails/__init__.py'):
-        content = content.replace('from guardrails.', 'from .')
-    
-    # Special case for nlp/__init__.py
-    if str(filepath).endswith('nlp/__init__.py'):
-        content = content.replace('from nlp.', 'from .')
-    
-    # Special case for integrations/__init__.py
-    if str(filepath).endswith('integrations/__init__.py'):
-        content = content.replace('from integrations.', 'from .')
+    # Special cases for package __init__.py files
+    if os.path.basename(filepath) == '__init__.py':
+        package = os.path.basename(os.path.dirname(filepath))
+        for old, new in INIT_REWRITES.get(package, ()):
+            content = content.replace(old, new)
     
     if content != original_content:
         with open(filepath, 'w') as f:
@@ -69,16 +90,36 @@ def fix_imports_in_file(filepath):
         return True
     return False
 
+def iter_python_files(directory):
+    """Yield paths of Python files under directory, recursively"""
+    # DirEntry caches the file type from the directory listing,
+    # so this needs no extra stat call per entry
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_python_files(entry.path)
+            elif entry.name.endswith('.py') and entry.is_file(follow_symlinks=False):
+                yield entry.path
+
 def main():
     src_dir = Path(__file__).parent / 'src'
     
-    # Find all Python files
-    python_files = list(src_dir.rglob('*.py'))
+    # Find all Python files, lazily
+    python_files = iter_python_files(src_dir)
     
+    # Files are independent, so fix them in parallel. Only a few files are
+    # queued at a time so the walk overlaps with the fixing instead of being
+    # turned into a future per file up front.
+    max_workers = os.cpu_count() or 1
     fixed_count = 0
-    for filepath in python_files:
-        if fix_imports_in_file(filepath):
-            fixed_count += 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for filepath in python_files:
+            if len(pending) >= max_workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                fixed_count += sum(future.result() for future in done)
+            pending.add(executor.submit(fix_imports_in_file, filepath))
+        fixed_count += sum(future.result() for future in wait(pending).done)
     
     print(f"\nFixed {fixed_count} files")
 
@@ -4,15 +4,25 @@ Intelligent agent handoff system for the Planning Assistant
 Implements the OpenAI Agents SDK handoff pattern for seamless delegation
 between specialized agents based on context and task complexity.
 """
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Deque, Iterable
 from datetime import datetime
+from collections import Counter, deque
+from functools import lru_cache
 from agents import Agent, function_tool, Handoff
 from pydantic import BaseModel
+from pydantic_core import to_json
 import json
+import re
 
 from models.context import PlanningContext, EntityContext
 from config import Config
 
+try:
+    # Optional: Aho-Corasick automaton for keyword matching
+    import ahocorasick
+except ImportError:  # pragma: no cover
+    ahocorasick = None
+
 
 class HandoffRequest(BaseModel):
     """Request for agent handoff"""
@@ -43,14 +53,109 @@ class AgentCapabilities(BaseModel):
     prerequisites: List[str] = []
 
 
+# Routing keywords for each specialized agent, in priority order
+_ROUTING_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    # Calendar-related requests
+    ("calendar_manager", (
+        "calendar", "schedule", "meeting", "appointment", "event",
+        "available", "free time", "book", "tomorrow", "today", "next week"
+    )),
+    # Task management requests
+    ("task_manager", (
+        "task", "todo", "project", "deadline", "priority", "complete",
+        "assign", "todoist", "work", "finish", "due"
+    )),
+    # Email-related requests
+    ("email_processor", (
+        "email", "mail", "inbox", "send", "reply", "gmail",
+        "message", "unread", "action items"
+    )),
+    # Complex planning requests
+    ("smart_planner", (
+        "plan", "optimize", "best time", "schedule everything",
+        "workload", "organize", "distribute", "balance"
+    )),
+    # NLP processing requests
+    ("nlp_processor", (
+        "extract", "analyze", "understand", "parse", "interpret"
+    )),
+)
+
+
+# Urgency indicators, in priority order
+_URGENCY_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    # High urgency indicators
+    ("critical", (
+        "urgent", "asap", "immediately", "now", "emergency", "critical"
+    )),
+    # Time-sensitive indicators
+    ("high", (
+        "today", "deadline", "due", "overdue", "soon"
+    )),
+    # Future planning
+    ("low", (
+        "next week", "later", "eventually", "someday"
+    )),
+)
+
+
+class _KeywordMatcher:
+    """Finds the highest-priority keyword bucket present in a text in one pass
+    
+    Uses a pyahocorasick automaton when available. Otherwise each bucket
+    becomes a capture group inside a zero-width lookahead, so ``finditer``
+    tries every position once and ``match.lastindex`` is the
+    highest-priority bucket with a keyword starting there.
+    """
+    
+    def __init__(self, buckets: Tuple[Tuple[str, Tuple[str, ...]], ...]):
+        self.names = [name for name, _ in buckets]
+        self._automaton = None
+        self._pattern = None
+        
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for priority, (_, keywords) in enumerate(buckets):
+                for word in keywords:
+                    # A keyword listed in several buckets keeps its best priority
+                    automaton.add_word(word, min(priority, automaton.get(word, priority)))
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            alternatives = "|".join(
+                "(" + "|".join(re.escape(word) for word in keywords) + ")"
+                for _, keywords in buckets
+            )
+            self._pattern = re.compile(f"(?=(?:{alternatives}))")
+    
+    def match(self, text: str) -> Optional[str]:
+        """Return the name of the highest-priority bucket with a keyword in text"""
+        if self._automaton is not None:
+            hits = {priority for _, priority in self._automaton.iter(text)}
+        else:
+            hits = {match.lastindex - 1 for match in self._pattern.finditer(text)}
+        return self.names[min(hits)] if hits else None
+
+
+# Built at import so every coordinator shares one compiled index per table
+_ROUTING_MATCHER = _KeywordMatcher(_ROUTING_KEYWORDS)
+_URGENCY_MATCHER = _KeywordMatcher(_URGENCY_KEYWORDS)
+
+
 class HandoffCoordinator:
     """Coordinates intelligent handoffs between agents"""
     
     def __init__(self, config: Config):
         self.config = config
-        self.handoff_history: List[Dict[str, Any]] = []
         self.agent_workload: Dict[str, int] = {}
         
+        # Bounded history with running distributions over the retained records
+        self._handoff_history: Deque[Dict[str, Any]] = deque(maxlen=config.max_handoff_history)
+        self._agent_usage: Counter = Counter()
+        self._urgency_distribution: Counter = Counter()
+        # Monotonic so ids stay unique once old records are evicted
+        self._handoff_counter = 0
+        
         # Define agent capabilities
         self.capabilities = {
             "nlp_processor": AgentCapabilities(
@@ -93,6 +198,44 @@ class HandoffCoordinator:
                 prerequisites=["calendar_access", "task_data"]
             )
         }
+        
+        # Capabilities are fixed, so their function lists are joined once
+        self._cap_functions_joined = {
+            name: ', '.join(capability.primary_functions)
+            for name, capability in self.capabilities.items()
+        }
+    
+    @property
+    def handoff_history(self) -> Tuple[Dict[str, Any], ...]:
+        """Snapshot of the recorded handoffs, oldest first"""
+        # Records must be added through _append_handoff to keep the counters in step
+        return tuple(self._handoff_history)
+    
+    @handoff_history.setter
+    def handoff_history(self, records: Iterable[Dict[str, Any]]):
+        self._handoff_history = deque(maxlen=self._handoff_history.maxlen)
+        self._agent_usage.clear()
+        self._urgency_distribution.clear()
+        for record in records:
+            self._append_handoff(record)
+        self._handoff_counter = max(self._handoff_counter, len(self._handoff_history))
+    
+    def _append_handoff(self, record: Dict[str, Any]):
+        """Add a record to the history, keeping the running distributions in sync"""
+        
+        history = self._handoff_history
+        if len(history) == history.maxlen:
+            # The oldest record is about to be evicted
+            evicted = history[0]
+            for counter, key in ((self._agent_usage, evicted["target_agent"]),
+                                 (self._urgency_distribution, evicted["urgency"])):
+                counter[key] -= 1
+                if not counter[key]:
+                    del counter[key]
+        
+        history.append(record)
+        self._agent_usage[record["target_agent"]] += 1
+        self._urgency_distribution[record["urgency"]] += 1
     
     def analyze_handoff_need(self, 
                            current_context: PlanningContext, 
@@ -103,18 +246,22 @@ class HandoffCoordinator:
         # Extract key entities and intents
         entities = current_context.entity_context
         
+        # Both keyword passes work on the same lowercased request
+        request_lower = user_request.lower()
+        
         # Determine if specialized agent is needed
-        target_agent = self._determine_target_agent(user_request, entities, current_agent)
+        target_agent = self._determine_target_agent(request_lower, entities, current_agent)
         
         if target_agent and target_agent != current_agent:
             # Calculate urgency
-            urgency = self._calculate_urgency(user_request, entities)
+            urgency = self._calculate_urgency(request_lower, entities)
             
-            # Prepare context for handoff
+            # Prepare context for handoff. Models are kept as-is and only
+            # serialized once, when the handoff instructions are generated.
             handoff_context = {
                 "original_request": user_request,
-                "extracted_entities": entities.model_dump() if entities else {},
-                "user_preferences": current_context.user_preferences.model_dump() if current_context.user_preferences else {},
+                "extracted_entities": entities if entities else {},
+                "user_preferences": current_context.user_preferences if current_context.user_preferences else {},
                 "session_id": current_context.session_id,
                 "timestamp": datetime.now().isoformat()
             }
@@ -130,73 +277,18 @@ class HandoffCoordinator:
         return None
     
     def _determine_target_agent(self, 
-                              request: str, 
+                              request_lower: str, 
                               entities: Optional[EntityContext],
                               current_agent: str) -> Optional[str]:
-        """Determine which agent should handle the request"""
-        
-        request_lower = request.lower()
-        
-        # Calendar-related requests
-        if any(word in request_lower for word in [
-            "calendar", "schedule", "meeting", "appointment", "event",
-            "available", "free time", "book", "tomorrow", "today", "next week"
-        ]):
-            return "calendar_manager"
-        
-        # Task management requests
-        elif any(word in request_lower for word in [
-            "task", "todo", "project", "deadline", "priority", "complete",
-            "assign", "todoist", "work", "finish", "due"
-        ]):
-            return "task_manager"
-        
-        # Email-related requests
-        elif any(word in request_lower for word in [
-            "email", "mail", "inbox", "send", "reply", "gmail", 
-            "message", "unread", "action items"
-        ]):
-            return "email_processor"
-        
-        # Complex planning requests
-        elif any(word in request_lower for word in [
-            "plan", "optimize", "best time", "schedule everything",
-            "workload", "organize", "distribute", "balance"
-        ]):
-            return "smart_planner"
-        
-        # NLP processing requests
-        elif any(word in request_lower for word in [
-            "extract", "analyze", "understand", "parse", "interpret"
-        ]):
-            return "nlp_processor"
+        """Determine which agent should handle the already-lowercased request"""
         
-        return None
+        # Collect every bucket hit in one pass and pick the highest priority
+        return _ROUTING_MATCHER.match(request_lower)
     
-    def _calculate_urgency(self, request: str, entities: Optional[EntityContext]) -> str:
-        """Calculate urgency level for the handoff"""
-        
-        request_lower = request.lower()
-        
-        # High urgency indicators
-        if any(word in request_lower for word in [
-            "urgent", "asap", "immediately", "now", "emergency", "critical"
-        ]):
-            return "critical"
-        
-        # Time-sensitive indicators
-        elif any(word in request_lower for word in [
-            "today", "deadline", "due", "overdue", "soon"
-        ]):
-            return "high"
-        
-        # Future planning
-        elif any(word in request_lower for word in [
-            "next week", "later", "eventually", "someday"
-        ]):
-            return "low"
-        
-        return "normal"
+    def _calculate_urgency(self, request_lower: str, entities: Optional[EntityContext]) -> str:
+        """Calculate urgency level for the already-lowercased request"""
+        
+        return _URGENCY_MATCHER.match(request_lower) or "normal"
     
     def create_handoff(self, request: HandoffRequest) -> Handoff:
         """Create an OpenAI Agents SDK Handoff object"""
@@ -205,8 +297,12 @@ class HandoffCoordinator:
         if not capabilities:
             raise ValueError(f"Unknown agent: {request.target_agent}")
         
+        # Serialize the context once for both the instructions and the record.
+        # Compact output keeps the instructions short and leaves non-ASCII as is.
+        context_json = to_json(request.context).decode()
+        
         # Create handoff instructions
-        instructions = self._generate_handoff_instructions(request, capabilities)
+        instructions = self._generate_handoff_instructions(request, capabilities, context_json)
         
         # Create the handoff
         handoff = Handoff(
@@ -215,32 +311,38 @@ class HandoffCoordinator:
         )
         
         # Record handoff
-        self._record_handoff(request, handoff)
+        self._record_handoff(request, handoff, context_json)
         
         return handoff
     
     def _generate_handoff_instructions(self, 
                                      request: HandoffRequest, 
-                                     capabilities: AgentCapabilities) -> str:
+                                     capabilities: AgentCapabilities,
+                                     context_json: Optional[str] = None) -> str:
         """Generate specific instructions for the target agent"""
         
+        if context_json is None:
+            context_json = to_json(request.context).decode()
+        
+        primary_functions = self._cap_functions_joined[request.target_agent]
+        
         base_instruction = f"""
 You are being handed off to handle a {request.urgency} priority request.
 
 CONTEXT:
 - Original request: {request.context.get('original_request', 'N/A')}
 - Handoff reason: {request.reason}
-- Your capabilities: {', '.join(capabilities.primary_functions)}
+- Your capabilities: {primary_functions}
 - Expected duration: {capabilities.typical_duration}
 
 TASK:
 Please handle this request using your specialized capabilities. Focus on:
 1. Addressing the specific user need
-2. Utilizing your primary functions: {', '.join(capabilities.primary_functions)}
+2. Utilizing your primary functions: {primary_functions}
 3. Returning clear, actionable results
 
 CONTEXT DATA:
-{json.dumps(request.context, indent=2)}
+{context_json}
 """
         
         # Add urgency-specific instructions
@@ -255,20 +357,28 @@ CONTEXT DATA:
         
         return base_instruction.strip()
     
-    def _record_handoff(self, request: HandoffRequest, handoff: Handoff):
+    def _record_handoff(self, 
+                        request: HandoffRequest, 
+                        handoff: Handoff,
+                        context_json: Optional[str] = None):
         """Record handoff for tracking and analysis"""
         
+        # Size of the serialized context; reuse it when the caller already has it
+        if context_json is None:
+            context_json = to_json(request.context).decode()
+        
+        self._handoff_counter += 1
         handoff_record = {
-            "id": f"handoff_{len(self.handoff_history) + 1}",
+            "id": f"handoff_{self._handoff_counter}",
             "timestamp": datetime.now().isoformat(),
             "target_agent": request.target_agent,
             "reason": request.reason,
             "urgency": request.urgency,
-            "context_size": len(str(request.context)),
+            "context_size": len(context_json),
             "expected_outcome": request.expected_outcome
         }
         
-        self.handoff_history.append(handoff_record)
+        self._append_handoff(handoff_record)
         
         # Update agent workload
         self.agent_workload[request.target_agent] = self.agent_workload.get(request.target_agent, 0) + 1
@@ -276,33 +386,28 @@ CONTEXT DATA:
     def get_handoff_analytics(self) -> Dict[str, Any]:
         """Get analytics on handoff patterns"""
         
-        if not self.handoff_history:
+        if not self._handoff_history:
             return {"message": "No handoffs recorded yet"}
         
-        # Agent usage distribution
-        agent_usage = {}
-        urgency_distribution = {}
-        
-        for handoff in self.handoff_history:
-            agent = handoff["target_agent"]
-            urgency = handoff["urgency"]
-            
-            agent_usage[agent] = agent_usage.get(agent, 0) + 1
-            urgency_distribution[urgency] = urgency_distribution.get(urgency, 0) + 1
-        
-        # Most efficient handoffs (quick resolution)
-        recent_handoffs = self.handoff_history[-10:] if len(self.handoff_history) > 10 else self.handoff_history
+        # Agent usage and urgency distributions are maintained as handoffs are recorded
+        agent_usage = self._agent_usage
         
         return {
-            "total_handoffs": len(self.handoff_history),
-            "agent_usage_distribution": agent_usage,
-            "urgency_distribution": urgency_distribution,
+            "total_handoffs": len(self._handoff_history),
+            "agent_usage_distribution": dict(agent_usage),
+            "urgency_distribution": dict(self._urgency_distribution),
             "current_workload": self.agent_workload,
-            "recent_handoff_count": len(recent_handoffs),
-            "most_used_agent": max(agent_usage.items(), key=lambda x: x[1])[0] if agent_usage else None
+            "recent_handoff_count": min(len(self._handoff_history), 10),
+            "most_used_agent": agent_usage.most_common(1)[0][0] if agent_usage else None
         }
 
 
+@lru_cache(maxsize=1)
+def _get_coordinator() -> HandoffCoordinator:
+    """Shared coordinator so handoff tools keep history and workload across calls"""
+    return HandoffCoordinator(Config())
+
+
 # Function tools for handoff management
 @function_tool
 async def request_agent_handoff(
@@ -322,7 +427,7 @@ async def request_agent_handoff(
         expected_outcome: Expected outcome description
     """
     
-    coordinator = HandoffCoordinator(Config())
+    coordinator = _get_coordinator()
     
     try:
         # Parse context JSON
@@ -376,7 +481,7 @@ async def request_agent_handoff(
 async def analyze_handoff_patterns() -> str:
     """Analyze handoff patterns and efficiency"""
     
-    coordinator = HandoffCoordinator(Config())
+    coordinator = _get_coordinator()
     analytics = coordinator.get_handoff_analytics()
     
     return json.dumps({
@@ -411,8 +516,14 @@ def _generate_handoff_recommendations(analytics: Dict[str, Any]) -> List[str]:
     # Workload balance recommendations
     workload = analytics.get("current_workload", {})
     if workload:
-        max_load = max(workload.values())
-        min_load = min(workload.values())
+        # Find the busiest and idlest agents in one pass
+        loads = iter(workload.values())
+        max_load = min_load = next(loads)
+        for load in loads:
+            if load > max_load:
+                max_load = load
+            elif load < min_load:
+                min_load = load
         if max_load > min_load * 3:
             recommendations.append("Uneven agent workload detected - consider load balancing")
     
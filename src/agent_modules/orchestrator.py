@@ -1,7 +1,8 @@
 """
 Orchestrator agent that coordinates between all other agents
 """
-from typing import Optional, List
+from typing import Optional, List, Tuple, Any
+from collections import OrderedDict
 from agents import Agent
 from pydantic import BaseModel
 
@@ -24,13 +25,51 @@ class OrchestratorOutput(BaseModel):
     requires_confirmation: bool = False
 
 
+# Recently built orchestrators, keyed by _orchestrator_cache_key
+_ORCHESTRATOR_CACHE_SIZE = 8
+_orchestrator_cache: "OrderedDict[Tuple, Tuple[Any, Agent]]" = OrderedDict()
+
+
+def _orchestrator_cache_key(config) -> Tuple:
+    """Identify a config instance and the settings the agent graph is built from"""
+    return (
+        id(config),
+        config.openai_model,
+        config.todoist_api_key,
+        config.spacy_model,
+        config.google_client_id,
+        config.google_client_secret,
+        config.google_redirect_uri,
+    )
+
+
 async def create_orchestrator_agent(config) -> Agent:
     """
     Create the main orchestrator agent with all sub-agents and tools
     
-    Using the pattern where specialized agents are tools of the orchestrator
+    Using the pattern where specialized agents are tools of the orchestrator.
+    The agent graph is reused for repeated calls with the same, unchanged config.
     """
     
+    key = _orchestrator_cache_key(config)
+    cached = _orchestrator_cache.get(key)
+    if cached is not None:
+        _orchestrator_cache.move_to_end(key)
+        return cached[1]
+    
+    orchestrator = _build_orchestrator_agent(config)
+    
+    # Holding the config keeps its id from being reused while the entry lives
+    _orchestrator_cache[key] = (config, orchestrator)
+    if len(_orchestrator_cache) > _ORCHESTRATOR_CACHE_SIZE:
+        _orchestrator_cache.popitem(last=False)
+    
+    return orchestrator
+
+
+def _build_orchestrator_agent(config) -> Agent:
+    """Build the orchestrator, its specialized sub-agents and their tools"""
+    
     # Initialize all tools first
     calendar_tool = create_calendar_tool()
     todoist_tool = create_todoist_tool(config.todoist_api_key)
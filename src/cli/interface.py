@@ -2,50 +2,49 @@
 CLI Chat Interface for the Planning Assistant
 """
 import asyncio
+import functools
+import json
+import re
+import time
 from typing import Optional
-from rich.console import Console
-from rich.prompt import Prompt
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.live import Live
-from rich.spinner import Spinner
 from rich.table import Table
+from rich.text import Text
 from openai.types.responses import ResponseTextDeltaEvent
 from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
+from prompt_toolkit.history import FileHistory, ThreadedHistory
 from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-import os
 from pathlib import Path
-from agents import Runner, SQLiteSession
+from agents import Runner
 from agents import InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered
-from monitoring.tracer import get_tracer, init_tracer
+from config import get_config
+from cli.session import open_conversation_session, tool_call_name
+from monitoring.tracer import init_tracer
 from monitoring.dashboard import get_dashboard
 
 console = Console()
 
+# Streaming redraws: at most one per interval unless enough text or a line
+# or code-fence boundary has arrived since the last one
+_STREAM_REFRESH_INTERVAL = 0.04  # seconds
+_STREAM_REFRESH_CHARS = 200
+_STREAM_REFRESH_BOUNDARIES = ("\n", "```")
 
-class PlannerCLI:
-    """Interactive CLI for the Planning Assistant"""
-    
-    def __init__(self, orchestrator_agent=None):
-        self.orchestrator = orchestrator_agent
-        self.prompt_session = PromptSession(
-            history=FileHistory(str(Path.home() / '.planner_history')),
-            auto_suggest=AutoSuggestFromHistory(),
-        )
-        self.running = False
-        # SQLite session for conversation memory
-        self.agent_session = None
-        self.streaming_mode = True
-        
-        # Initialize monitoring
-        self.tracer = init_tracer()
-        self.dashboard = get_dashboard()
-        self.conversation_trace = None
-        
-    def display_welcome(self):
-        """Display welcome message and instructions"""
-        welcome_text = """
+# Yield to other tasks after this many stream events so long bursts don't starve them
+_STREAM_YIELD_EVERY = 32
+
+# Stream event and item types, ordered by how often they arrive
+_RAW_RESPONSE_EVENT = "raw_response_event"
+_RUN_ITEM_EVENT = "run_item_stream_event"
+_AGENT_UPDATED_EVENT = "agent_updated_stream_event"
+_HANDOFF_EVENT = "handoff_stream_event"
+_TOOL_CALL_ITEM = "tool_call_item"
+_TOOL_OUTPUT_ITEM = "tool_call_output_item"
+
+_WELCOME_TEXT = """
 # 🗓️ AI Planning Assistant
 
 Welcome to your intelligent planning assistant that integrates:
@@ -61,7 +60,7 @@ Welcome to your intelligent planning assistant that integrates:
 - `/sync` - Force sync all services
 - `/stream` - Toggle streaming mode
 - `/handoffs` - Show agent handoff analytics
-- `/monitor` - Open monitoring dashboard
+- `/monitor` - Toggle monitoring dashboard
 - `/analytics` - Show system analytics
 - `/clear` - Clear the screen
 - `/exit` or `/quit` - Exit the application
@@ -71,28 +70,147 @@ Welcome to your intelligent planning assistant that integrates:
 - "Add a task to buy groceries with high priority"
 - "Schedule time to work on the presentation tomorrow"
 - "Check my emails and create tasks for important ones"
-        """
-        console.print(Panel(Markdown(welcome_text), title="Welcome", border_style="blue"))
+"""
+
+
+# Characters, line breaks and ordered-list prefixes that can make Markdown
+# render differently from the same text printed plainly
+_MARKDOWN_SYNTAX = re.compile(r"[#*+\->\\_`~\[\]<&|\n\r\t\v\f]|^\s*\d+[.)]")
+
+
+def _response_renderable(response: str):
+    """Render a response as Markdown only when it contains markdown syntax"""
+    if response.strip() and not _MARKDOWN_SYNTAX.search(response):
+        # Same output as Markdown, without running the parser
+        return Text(response.strip())
+    return Markdown(response)
+
+
+def _head(text: str, limit: int = 100) -> str:
+    """Preview of text for trace messages, marked with ... only when truncated"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+# Reported by /status until the agents expose real connection state
+_PLACEHOLDER_STATUS = (
+    ("MacOS Calendar", "🟢 Connected", "2 min ago"),
+    ("Todoist", "🟢 Connected", "1 min ago"),
+    ("Gmail", "🟡 Authenticating", "N/A"),
+    ("iCloud", "🔴 Not configured", "N/A"),
+)
+
+
+@functools.cache
+def _welcome_panel() -> Panel:
+    """Welcome panel, with its markdown parsed once per session"""
+    return Panel(Markdown(_WELCOME_TEXT), title="Welcome", border_style="blue")
+
+
+@functools.cache
+def _status_table() -> Table:
+    """Service status table, built once while the statuses are static"""
+    table = Table(title="Service Status", show_header=True, header_style="bold magenta")
+    table.add_column("Service", style="cyan", no_wrap=True)
+    table.add_column("Status", justify="center")
+    table.add_column("Last Sync", justify="right")
     
-    def display_status(self):
-        """Display current service connection status"""
-        table = Table(title="Service Status", show_header=True, header_style="bold magenta")
-        table.add_column("Service", style="cyan", no_wrap=True)
-        table.add_column("Status", justify="center")
-        table.add_column("Last Sync", justify="right")
+    # TODO: Get actual status from agents
+    for service, status, last_sync in _PLACEHOLDER_STATUS:
+        table.add_row(service, status, last_sync)
+    return table
+
+
+class PlannerCLI:
+    """Interactive CLI for the Planning Assistant"""
+    
+    def __init__(self, orchestrator_agent=None):
+        self.orchestrator = orchestrator_agent
+        # History is loaded on a background thread so a long file doesn't delay the prompt
+        self.prompt_session = PromptSession(
+            history=ThreadedHistory(FileHistory(str(Path.home() / '.planner_history'))),
+            auto_suggest=AutoSuggestFromHistory(),
+        )
+        self.running = False
+        # SQLite session for conversation memory
+        self.agent_session = None
+        self.streaming_mode = True
         
-        # TODO: Get actual status from agents
-        services = [
-            ("MacOS Calendar", "🟢 Connected", "2 min ago"),
-            ("Todoist", "🟢 Connected", "1 min ago"),
-            ("Gmail", "🟡 Authenticating", "N/A"),
-            ("iCloud", "🔴 Not configured", "N/A"),
-        ]
+        # Initialize monitoring
+        self.tracer = init_tracer()
+        self.dashboard = get_dashboard()
+        self.conversation_trace = None
+        
+        # Tracer calls are queued and recorded by a background task, in order,
+        # so logging them stays out of the response path
+        self._trace_queue: asyncio.Queue = asyncio.Queue()
+        self._trace_worker: Optional[asyncio.Task] = None
+        
+        # Last rendered /analytics view and the data it was built from
+        self._last_analytics_key: Optional[str] = None
+        self._last_analytics_view: Optional[Group] = None
+        
+        # Monitoring dashboard, running alongside the prompt while toggled on
+        self._dashboard_task: Optional[asyncio.Task] = None
         
-        for service, status, last_sync in services:
-            table.add_row(service, status, last_sync)
+        # Services synced by /sync, concurrently
+        self._services = ("MacOS Calendar", "Todoist", "Gmail", "iCloud")
         
-        console.print(table)
+        # Slash commands other than /exit and /quit, which end the loop
+        self._commands = {
+            '/help': self._cmd_help,
+            '/status': self._cmd_status,
+            '/clear': self._cmd_clear,
+            '/sync': self._cmd_sync,
+            '/stream': self._cmd_stream,
+            '/handoffs': self.show_handoff_analytics,
+            '/monitor': self._cmd_monitor,
+            '/analytics': self.show_system_analytics,
+        }
+        
+    def display_welcome(self):
+        """Display welcome message and instructions"""
+        console.print(_welcome_panel())
+    
+    def display_status(self):
+        """Display current service connection status"""
+        console.print(_status_table())
+    
+    def _defer_trace(self, record, *args, **kwargs):
+        """Queue a tracer call for the background trace worker"""
+        if self._trace_worker is None:
+            self._trace_worker = asyncio.create_task(self._drain_trace_queue())
+        self._trace_queue.put_nowait((record, args, kwargs))
+    
+    async def _drain_trace_queue(self):
+        """Record queued tracer calls as they arrive"""
+        while True:
+            record, args, kwargs = await self._trace_queue.get()
+            try:
+                record(*args, **kwargs)
+            except Exception as e:
+                console.print(f"[dim]⚠️ Failed to record trace: {e}[/dim]")
+            finally:
+                self._trace_queue.task_done()
+    
+    async def _flush_traces(self):
+        """Wait for queued tracer calls and stop the background worker"""
+        if self._trace_worker is None:
+            return
+        await self._trace_queue.join()
+        self._trace_worker.cancel()
+        await asyncio.gather(self._trace_worker, return_exceptions=True)
+        self._trace_worker = None
+    
+    async def _startup(self):
+        """Open the conversation session and start tracing ahead of the first message"""
+        if not self.agent_session:
+            # Opening the database and creating its schema is blocking file I/O
+            self.agent_session = await asyncio.to_thread(open_conversation_session, "main_conversation")
+        
+        if not self.conversation_trace:
+            self.conversation_trace = self.tracer.start_conversation(
+                session_id=self.agent_session.session_id
+            )
     
     async def process_message(self, message: str) -> str:
         """Process user message through the orchestrator agent"""
@@ -100,25 +218,19 @@ Welcome to your intelligent planning assistant that integrates:
             return "⚠️ Orchestrator agent not initialized. Please check your configuration."
         
         try:
-            # Initialize session if not exists
-            if not self.agent_session:
-                self.agent_session = SQLiteSession(
-                    session_id="main_conversation",
-                    db_path="data/conversations.db"
-                )
-            
-            # Start conversation tracing if not already started
+            # run() does this before the first prompt; cover direct callers
             if not self.conversation_trace:
-                self.conversation_trace = self.tracer.start_conversation(
-                    session_id=self.agent_session.session_id
-                )
+                await self._startup()
+            
+            # Every event of the conversation shares this one session id string
+            session_id = self.conversation_trace.session_id
             
             # Trace user input
-            self.tracer._add_event(self.tracer.create_event(
+            self._defer_trace(self.tracer._add_event, self.tracer.create_event(
                 event_type="user_input",
                 level="info", 
-                session_id=self.conversation_trace.session_id,
-                message=f"User input: {message[:100]}...",
+                session_id=session_id,
+                message=f"User input: {_head(message)}",
                 data={"input_length": len(message)}
             ))
             
@@ -128,11 +240,11 @@ Welcome to your intelligent planning assistant that integrates:
                 result = await self._process_non_streaming(message)
             
             # Trace system output
-            self.tracer._add_event(self.tracer.create_event(
+            self._defer_trace(self.tracer._add_event, self.tracer.create_event(
                 event_type="system_output",
                 level="info",
-                session_id=self.conversation_trace.session_id,
-                message=f"System output: {result[:100]}...",
+                session_id=session_id,
+                message=f"System output: {_head(result)}",
                 data={"output_length": len(result)}
             ))
             
@@ -141,7 +253,8 @@ Welcome to your intelligent planning assistant that integrates:
         except InputGuardrailTripwireTriggered as e:
             error_msg = f"🛡️ Input blocked by safety guardrail: {e.guardrail_output.output_info}"
             if self.conversation_trace:
-                self.tracer.trace_error(
+                self._defer_trace(
+                    self.tracer.trace_error,
                     error=e,
                     context={"type": "input_guardrail", "message": message},
                     session_id=self.conversation_trace.session_id
@@ -150,7 +263,8 @@ Welcome to your intelligent planning assistant that integrates:
         except OutputGuardrailTripwireTriggered as e:
             error_msg = f"🛡️ Response blocked by safety guardrail: {e.guardrail_output.output_info}"
             if self.conversation_trace:
-                self.tracer.trace_error(
+                self._defer_trace(
+                    self.tracer.trace_error,
                     error=e,
                     context={"type": "output_guardrail", "message": message},
                     session_id=self.conversation_trace.session_id
@@ -159,7 +273,8 @@ Welcome to your intelligent planning assistant that integrates:
         except Exception as e:
             error_msg = f"❌ Error processing request: {str(e)}"
             if self.conversation_trace:
-                self.tracer.trace_error(
+                self._defer_trace(
+                    self.tracer.trace_error,
                     error=e,
                     context={"message": message},
                     session_id=self.conversation_trace.session_id
@@ -173,13 +288,15 @@ Welcome to your intelligent planning assistant that integrates:
                 self.orchestrator, 
                 message,
                 session=self.agent_session,
-                max_turns=10
+                max_turns=get_config().max_agent_turns
             )
         return str(result.final_output)
     
     async def _process_streaming(self, message: str) -> str:
         """Process message with streaming output"""
-        output_text = ""
+        # Deltas are collected and joined on redraw; += would copy the whole
+        # text per token once the rendered Markdown holds a reference to it
+        chunks: list[str] = []
         panel = Panel(
             "",
             title="🤖 Assistant (Streaming)",
@@ -187,109 +304,171 @@ Welcome to your intelligent planning assistant that integrates:
             padding=(1, 2)
         )
         
-        with Live(panel, console=console, refresh_per_second=10) as live:
+        # Repaints are driven by refresh() below, only when the text changed
+        with Live(panel, console=console, auto_refresh=False) as live:
+            last_refresh = time.monotonic()
+            pending_chars = 0
+            # Tool and handoff notices, printed together on the next refresh
+            pending_events: list[str] = []
+            
+            def refresh():
+                """Print pending notices and re-render new text into the live panel"""
+                nonlocal last_refresh, pending_chars
+                if pending_events:
+                    console.print("\n".join(pending_events))
+                    pending_events.clear()
+                if pending_chars:
+                    panel.renderable = Markdown("".join(chunks))
+                    live.update(panel, refresh=True)
+                last_refresh = time.monotonic()
+                pending_chars = 0
+            
+            def notify(line: str):
+                """Queue a notice, printing it now if the display has been idle"""
+                pending_events.append(line)
+                if time.monotonic() - last_refresh >= _STREAM_REFRESH_INTERVAL:
+                    refresh()
+            
             # Run with streaming
             result = Runner.run_streamed(
                 self.orchestrator,
                 message,
                 session=self.agent_session,
-                max_turns=10
+                max_turns=get_config().max_agent_turns
             )
             
             # Stream events
+            event_count = 0
             async for event in result.stream_events():
-                if event.type == "raw_response_event":
+                event_type = event.type
+                if event_type == _RAW_RESPONSE_EVENT:
                     # Handle text deltas for streaming output
                     if isinstance(event.data, ResponseTextDeltaEvent):
-                        output_text += event.data.delta
-                        panel.renderable = Markdown(output_text)
-                        live.update(panel)
+                        delta = event.data.delta
+                        chunks.append(delta)
+                        pending_chars += len(delta)
+                        # Re-parsing the whole markdown per token is quadratic,
+                        # so only redraw when something worth showing arrived
+                        if (pending_chars >= _STREAM_REFRESH_CHARS
+                                or delta.endswith(_STREAM_REFRESH_BOUNDARIES)
+                                or time.monotonic() - last_refresh >= _STREAM_REFRESH_INTERVAL):
+                            refresh()
                 
-                elif event.type == "run_item_stream_event":
+                elif event_type == _RUN_ITEM_EVENT:
                     # Handle completed items
-                    if event.item.type == "tool_call_item":
+                    item_type = event.item.type
+                    if item_type == _TOOL_CALL_ITEM:
                         # Get tool name from raw_item - handle different tool call types
-                        tool_name = "Unknown tool"
-                        raw_item = event.item.raw_item
-
-                        # Try different ways to get the tool name in priority order
-                        if hasattr(raw_item, 'tool_name'):
-                            tool_name = raw_item.tool_name
-                        elif hasattr(raw_item, 'id'):
-                            tool_name = raw_item.id
-                        elif hasattr(raw_item, 'function') and hasattr(raw_item.function, 'name'):
-                            tool_name = raw_item.function.name
-                        elif hasattr(raw_item, 'name'):
-                            tool_name = raw_item.name
-                        elif hasattr(raw_item, 'type'):
-                            tool_name = f"{raw_item.type} tool"
-                        else:
-                            console.log("Debug: tool call missing name or identifier")
-
-                        console.print(f"[dim]🔧 Calling tool: {tool_name}[/dim]")
-                    elif event.item.type == "tool_call_output_item":
-                        console.print(f"[dim]✓ Tool completed[/dim]")
+                        tool_name = tool_call_name(event.item.raw_item)
+                        notify(f"[dim]🔧 Calling tool: {tool_name}[/dim]")
+                    elif item_type == _TOOL_OUTPUT_ITEM:
+                        notify(f"[dim]✓ Tool completed[/dim]")
                 
-                elif event.type == "agent_updated_stream_event":
+                elif event_type == _AGENT_UPDATED_EVENT:
                     # Show agent handoffs
-                    console.print(f"[blue]→ Handoff to: {event.new_agent.name}[/blue]")
+                    notify(f"[blue]→ Handoff to: {event.new_agent.name}[/blue]")
                     
-                elif event.type == "handoff_stream_event":
+                elif event_type == _HANDOFF_EVENT:
                     # Show detailed handoff information
                     if hasattr(event, 'handoff_reason'):
-                        console.print(f"[cyan]🔄 Handoff: {event.handoff_reason}[/cyan]")
+                        notify(f"[cyan]🔄 Handoff: {event.handoff_reason}[/cyan]")
+                
+                event_count += 1
+                if event_count % _STREAM_YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
             
             # Stream events are already handled above
             # RunResultStreaming doesn't support direct await
             
-        return output_text or "Response completed"
+            # Show whatever arrived after the last redraw
+            if pending_chars or pending_events:
+                refresh()
+            
+        return "".join(chunks) or "Response completed"
     
     async def handle_command(self, command: str) -> bool:
         """Handle special commands. Returns True if should continue, False to exit"""
         command = command.lower().strip()
         
-        if command in ['/exit', '/quit']:
-            # End conversation trace
-            if self.conversation_trace:
-                self.tracer.end_conversation(self.conversation_trace.session_id)
-                console.print(f"[dim]💾 Conversation trace saved[/dim]")
-            console.print("[yellow]Goodbye! 👋[/yellow]")
+        if command in ('/exit', '/quit'):
+            await self._cmd_exit()
             return False
-            
-        elif command == '/help':
-            self.display_welcome()
-            
-        elif command == '/status':
-            self.display_status()
-            
-        elif command == '/clear':
-            console.clear()
-            
-        elif command == '/sync':
-            with console.status("[bold green]Syncing all services...", spinner="dots"):
-                await asyncio.sleep(2)  # TODO: Actual sync
-            console.print("[green]✓ All services synced successfully[/green]")
-            
-        elif command == '/stream':
-            self.streaming_mode = not self.streaming_mode
-            mode = "enabled" if self.streaming_mode else "disabled"
-            console.print(f"[cyan]Streaming mode {mode}[/cyan]")
-            
-        elif command == '/handoffs':
-            await self.show_handoff_analytics()
-            
-        elif command == '/monitor':
-            console.print("[cyan]Starting monitoring dashboard...[/cyan]")
-            await self.dashboard.run_dashboard()
-            
-        elif command == '/analytics':
-            await self.show_system_analytics()
-            
+        
+        handler = self._commands.get(command)
+        if handler:
+            await handler()
         else:
             console.print(f"[red]Unknown command: {command}[/red]")
             
         return True
     
+    async def _cmd_exit(self):
+        """End the session: /exit, /quit"""
+        await self._stop_dashboard()
+        # End conversation trace once every queued event is recorded
+        await self._flush_traces()
+        if self.conversation_trace:
+            self.tracer.end_conversation(self.conversation_trace.session_id)
+            console.print(f"[dim]💾 Conversation trace saved[/dim]")
+        console.print("[yellow]Goodbye! 👋[/yellow]")
+    
+    async def _cmd_help(self):
+        """Show available commands: /help"""
+        self.display_welcome()
+    
+    async def _cmd_status(self):
+        """Show integration status: /status"""
+        self.display_status()
+    
+    async def _cmd_clear(self):
+        """Clear the screen: /clear"""
+        console.clear()
+    
+    async def _cmd_sync(self):
+        """Force sync all services: /sync"""
+        with console.status("[bold green]Syncing all services...", spinner="dots"):
+            results = await asyncio.gather(
+                *(self._sync_service(service) for service in self._services),
+                return_exceptions=True
+            )
+        
+        failures = [
+            (service, result) for service, result in zip(self._services, results)
+            if isinstance(result, Exception)
+        ]
+        for service, error in failures:
+            console.print(f"[red]❌ {service} sync failed: {error}[/red]")
+        if not failures:
+            console.print("[green]✓ All services synced successfully[/green]")
+    
+    async def _sync_service(self, service: str):
+        """Sync a single service"""
+        await asyncio.sleep(2)  # TODO: Actual sync
+    
+    async def _cmd_stream(self):
+        """Toggle streaming mode: /stream"""
+        self.streaming_mode = not self.streaming_mode
+        mode = "enabled" if self.streaming_mode else "disabled"
+        console.print(f"[cyan]Streaming mode {mode}[/cyan]")
+    
+    async def _cmd_monitor(self):
+        """Toggle the monitoring dashboard: /monitor"""
+        if self._dashboard_task and not self._dashboard_task.done():
+            await self._stop_dashboard()
+            console.print("[cyan]Monitoring dashboard stopped[/cyan]")
+            return
+        
+        console.print("[cyan]Starting monitoring dashboard...[/cyan]")
+        self._dashboard_task = asyncio.create_task(self.dashboard.run_dashboard())
+    
+    async def _stop_dashboard(self):
+        """Cancel the dashboard task, if any, and wait for it to clean up"""
+        if self._dashboard_task is None:
+            return
+        self._dashboard_task.cancel()
+        await asyncio.gather(self._dashboard_task, return_exceptions=True)
+        self._dashboard_task = None
+    
     async def show_handoff_analytics(self):
         """Display handoff analytics using the orchestrator"""
         try:
@@ -316,6 +495,12 @@ Welcome to your intelligent planning assistant that integrates:
         try:
             analytics = self.tracer.get_system_analytics()
             
+            # Reprint the previous view when nothing has changed since
+            analytics_key = json.dumps(analytics, sort_keys=True, default=str)
+            if analytics_key == self._last_analytics_key:
+                console.print(self._last_analytics_view)
+                return
+            
             # Overview table
             overview_table = Table(title="📊 System Overview")
             overview_table.add_column("Metric", style="cyan")
@@ -327,7 +512,8 @@ Welcome to your intelligent planning assistant that integrates:
             overview_table.add_row("Success Rate", f"{analytics['success_rate']:.1%}")
             overview_table.add_row("Total Handoffs", str(analytics["total_handoffs"]))
             
-            console.print(overview_table)
+            # Tables are collected and printed together in one write
+            renderables = [overview_table]
             
             # Agent usage table
             agent_usage = analytics.get("agent_usage", {})
@@ -339,7 +525,7 @@ Welcome to your intelligent planning assistant that integrates:
                 for agent, calls in sorted(agent_usage.items(), key=lambda x: x[1], reverse=True):
                     agent_table.add_row(agent, str(calls))
                 
-                console.print(agent_table)
+                renderables.append(agent_table)
             
             # Tool usage table
             tool_usage = analytics.get("tool_usage", {})
@@ -351,7 +537,7 @@ Welcome to your intelligent planning assistant that integrates:
                 for tool, calls in sorted(tool_usage.items(), key=lambda x: x[1], reverse=True):
                     tool_table.add_row(tool, str(calls))
                 
-                console.print(tool_table)
+                renderables.append(tool_table)
             
             # Performance metrics
             perf_metrics = analytics.get("performance_metrics", {})
@@ -369,10 +555,15 @@ Welcome to your intelligent planning assistant that integrates:
                     if metric != "counters" and isinstance(stats, dict):
                         perf_table.add_row(f"{metric} (avg)", f"{stats['avg_ms']:.1f}ms")
                 
-                console.print(perf_table)
+                renderables.append(perf_table)
             
             # Export option
-            console.print("\n💾 Export analytics with: /export <filename>")
+            renderables.append("\n💾 Export analytics with: /export <filename>")
+            
+            view = Group(*renderables)
+            self._last_analytics_key = analytics_key
+            self._last_analytics_view = view
+            console.print(view)
             
         except Exception as e:
             console.print(f"[red]❌ Error getting system analytics: {str(e)}[/red]")
@@ -382,15 +573,16 @@ Welcome to your intelligent planning assistant that integrates:
         self.running = True
         self.display_welcome()
         
+        # Pay the one-time session setup before the user's first message
+        if self.orchestrator:
+            await self._startup()
+        
         while self.running:
             try:
-                # Get user input
-                user_input = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.prompt_session.prompt(
-                        "\n💭 You: ",
-                        multiline=False,
-                    )
+                # Get user input without tying up an executor thread
+                user_input = await self.prompt_session.prompt_async(
+                    "\n💭 You: ",
+                    multiline=False,
                 )
                 
                 if not user_input.strip():
@@ -407,7 +599,7 @@ Welcome to your intelligent planning assistant that integrates:
                 # Display response (only if not streaming, since streaming displays live)
                 if not self.streaming_mode and response:
                     console.print(Panel(
-                        Markdown(response),
+                        _response_renderable(response),
                         title="🤖 Assistant",
                         border_style="green",
                         padding=(1, 2)
@@ -423,7 +615,10 @@ Welcome to your intelligent planning assistant that integrates:
                 
             except Exception as e:
                 console.print(f"[red]Unexpected error: {e}[/red]")
-                
+        
+        await self._stop_dashboard()
+        await self._flush_traces()
+
 
 async def main():
     """Entry point for the CLI"""
@@ -0,0 +1,70 @@
+"""
+Conversation session storage and stream helpers shared by the CLIs
+"""
+import logging
+from pathlib import Path
+from agents import SQLiteSession
+
+logger = logging.getLogger(__name__)
+
+# Conversation history, shared by both CLIs
+CONVERSATION_DB_PATH = Path("data") / "conversations.db"
+
+
+# Per-connection tuning for the conversation database: the SDK enables WAL,
+# and these trade fsyncs and page cache misses for memory. History reads go
+# through a 256MB memory map instead of read() calls.
+_CONVERSATION_DB_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+# SQLiteSession calls this private hook on every connection it opens; releases
+# without it never call the override below, so the pragmas aren't applied
+_SDK_CONFIGURES_CONNECTIONS = callable(getattr(SQLiteSession, "_configure_connection", None))
+
+
+class TunedSQLiteSession(SQLiteSession):
+    """SQLiteSession whose connections are tuned for frequent small appends"""
+    
+    def __init__(self, *args, **kwargs):
+        if not _SDK_CONFIGURES_CONNECTIONS:
+            logger.warning(
+                "This openai-agents release has no SQLiteSession connection hook; "
+                "conversation database connections will use SQLite defaults"
+            )
+        super().__init__(*args, **kwargs)
+    
+    @staticmethod
+    def _configure_connection(conn):
+        # Only takes effect on a new database, and only before WAL is enabled
+        conn.execute("PRAGMA page_size=8192")
+        SQLiteSession._configure_connection(conn)
+        for pragma in _CONVERSATION_DB_PRAGMAS:
+            conn.execute(pragma)
+
+
+def open_conversation_session(session_id: str) -> TunedSQLiteSession:
+    """Open a session in the conversation database, creating its directory if needed"""
+    CONVERSATION_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    return TunedSQLiteSession(session_id=session_id, db_path=CONVERSATION_DB_PATH)
+
+
+# Attribute paths that may name a tool call, in priority order
+_TOOL_NAME_PATHS = (("tool_name",), ("id",), ("function", "name"), ("name",))
+
+
+def tool_call_name(raw_item) -> str:
+    """Get a display name from the raw item of any tool call type"""
+    for path in _TOOL_NAME_PATHS:
+        value = raw_item
+        for attr in path:
+            value = getattr(value, attr, None)
+        if value is not None:
+            return value
+    
+    tool_type = getattr(raw_item, "type", None)
+    return f"{tool_type} tool" if tool_type is not None else "Unknown tool"
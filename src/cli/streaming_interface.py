@@ -2,79 +2,129 @@
 Streaming-enabled CLI interface for real-time agent responses
 """
 import asyncio
+import functools
+import time
 from typing import Optional
 from rich.console import Console
 from rich.live import Live
 from rich.panel import Panel
 from rich.markdown import Markdown
-from agents import Runner, SQLiteSession
+from rich.text import Text
+from agents import Runner
+from config import get_config
 from openai.types.responses import ResponseTextDeltaEvent
+from prompt_toolkit import PromptSession
+from prompt_toolkit.formatted_text import HTML
+from cli.session import open_conversation_session, tool_call_name
+from guardrails.output_safety import output_safety_guardrail
 
 console = Console()
 
+# Streamed text is repainted at most this often, or once this much has arrived
+_RENDER_INTERVAL = 0.1  # seconds
+_RENDER_CHARS = 256
+
+# The partial response is safety-checked again once this much more has arrived
+# and the previous check has finished
+_SAFETY_CHECK_CHARS = 512
+
+
+def _safety_tripped(task: asyncio.Task) -> bool:
+    """Whether a finished safety check flagged the text; a failed check counts as flagged"""
+    return not task.cancelled() and (task.exception() is not None or task.result().tripwire_triggered)
+
+_WELCOME_TEXT = "# 🚀 Streaming Planning Assistant\n\nWatch responses appear in real-time!"
+
+
+@functools.cache
+def _welcome_panel() -> Panel:
+    """Welcome panel, with its markdown parsed once per session"""
+    return Panel(Markdown(_WELCOME_TEXT), border_style="blue")
+
 
 class StreamingCLI:
     """CLI with streaming support for real-time agent responses"""
     
     def __init__(self, orchestrator_agent):
         self.orchestrator = orchestrator_agent
-        self.session = SQLiteSession(
-            session_id="streaming_conversation",
-            db_path="data/conversations.db"
-        )
+        # Same WAL/synchronous=NORMAL tuning as PlannerCLI's conversation session
+        self.session = open_conversation_session("streaming_conversation")
+        # Reads input on the event loop instead of an executor thread per prompt
+        self._prompt = PromptSession()
     
     async def process_with_streaming(self, message: str):
         """Process message with streaming output"""
         
-        # Create a panel for streaming output
-        output_text = ""
+        # Deltas are collected and joined only for safety checks and the final
+        # render, instead of copying the whole text per token with +=
+        chunks: list[str] = []
+        # In-flight text is appended to a plain Text; Markdown would re-parse the
+        # whole response each repaint, so it is only rendered once at the end
+        stream_text = Text()
         panel = Panel(
-            "",
+            stream_text,
             title="🤖 Assistant",
             border_style="green",
             padding=(1, 2)
         )
         
-        with Live(panel, console=console, refresh_per_second=10) as live:
+        # Repaints only happen after a batched flush, never on an idle timer
+        with Live(panel, console=console, auto_refresh=False) as live:
+            last_render = time.monotonic()
+            pending_chars = 0
+            # Output safety runs on the partial text while generation continues.
+            # These checks are extra guardrail calls on top of the run's own
+            # full-text output guardrail, so at most one is in flight at a time;
+            # one that trips stops the run and the rendering straight away
+            safety_task: Optional[asyncio.Task] = None
+            safety_tripped = False
+            streamed_chars = 0
+            checked_chars = 0
             try:
                 # Run with streaming
                 result = Runner.run_streamed(
                     self.orchestrator,
                     message,
                     session=self.session,
-                    max_turns=10
+                    max_turns=get_config().max_agent_turns
                 )
                 
+                def on_safety_checked(task: asyncio.Task):
+                    nonlocal safety_tripped
+                    if _safety_tripped(task):
+                        safety_tripped = True
+                        result.cancel()
+                
                 # Stream events
                 async for event in result.stream_events():
+                    if safety_tripped:
+                        break
                     if event.type == "raw_response_event":
                         # Handle text deltas for streaming output
                         if isinstance(event.data, ResponseTextDeltaEvent):
-                            output_text += event.data.delta
-                            panel.renderable = Markdown(output_text)
-                            live.update(panel)
+                            chunks.append(event.data.delta)
+                            stream_text.append(event.data.delta)
+                            pending_chars += len(event.data.delta)
+                            streamed_chars += len(event.data.delta)
+                            if (
+                                streamed_chars - checked_chars >= _SAFETY_CHECK_CHARS
+                                and (safety_task is None or safety_task.done())
+                            ):
+                                safety_task = asyncio.create_task(output_safety_guardrail(
+                                    None, self.orchestrator, "".join(chunks)
+                                ))
+                                safety_task.add_done_callback(on_safety_checked)
+                                checked_chars = streamed_chars
+                            now = time.monotonic()
+                            if pending_chars >= _RENDER_CHARS or now - last_render >= _RENDER_INTERVAL:
+                                live.refresh()
+                                last_render = now
+                                pending_chars = 0
                     
                     elif event.type == "run_item_stream_event":
                         # Handle completed items
                         if event.item.type == "tool_call_item":
-                            # Get tool name from raw_item - handle different tool call types
-                            tool_name = "Unknown tool"
-                            raw_item = event.item.raw_item
-
-                            # Try different ways to get the tool name in priority order
-                            if hasattr(raw_item, 'tool_name'):
-                                tool_name = raw_item.tool_name
-                            elif hasattr(raw_item, 'id'):
-                                tool_name = raw_item.id
-                            elif hasattr(raw_item, 'function') and hasattr(raw_item.function, 'name'):
-                                tool_name = raw_item.function.name
-                            elif hasattr(raw_item, 'name'):
-                                tool_name = raw_item.name
-                            elif hasattr(raw_item, 'type'):
-                                tool_name = f"{raw_item.type} tool"
-                            else:
-                                console.log("Debug: tool call missing name or identifier")
-
+                            tool_name = tool_call_name(event.item.raw_item)
                             console.print(f"[dim]🔧 Calling tool: {tool_name}[/dim]")
                         elif event.item.type == "tool_call_output_item":
                             console.print(f"[dim]✓ Tool completed[/dim]")
@@ -86,25 +136,42 @@ class StreamingCLI:
                 # Stream events have been processed above
                 # RunResultStreaming doesn't support direct await
                 
+                # The run's own output guardrail has checked the complete text;
+                # withhold it if a partial check tripped as well
+                if safety_task is not None and not safety_tripped:
+                    await asyncio.wait([safety_task])
+                    safety_tripped = _safety_tripped(safety_task)
+                if safety_tripped:
+                    panel.renderable = Text("Response withheld by the output safety check", style="red")
+                    live.refresh()
+                    console.print("[red]🛡️ Response blocked by safety guardrail[/red]")
+                    return None
+                
+                # Render the complete response as Markdown
+                output_text = "".join(chunks)
+                if output_text:
+                    panel.renderable = Markdown(output_text)
+                    live.refresh()
+                
             except Exception as e:
                 console.print(f"[red]Error: {e}[/red]")
                 return None
+            finally:
+                # Also covers cancellation and Ctrl-C mid-stream
+                if safety_task is not None and not safety_task.done():
+                    safety_task.cancel()
         
         return output_text
     
     async def run_interactive(self):
         """Run interactive streaming session"""
-        console.print(Panel(
-            Markdown("# 🚀 Streaming Planning Assistant\n\nWatch responses appear in real-time!"),
-            border_style="blue"
-        ))
+        console.print(_welcome_panel())
         
         while True:
             try:
                 # Get user input
-                user_input = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: console.input("\n[bold cyan]You:[/bold cyan] ")
+                user_input = await self._prompt.prompt_async(
+                    HTML("\n<b><ansicyan>You:</ansicyan></b> ")
                 )
                 
                 if user_input.lower() in ['/exit', '/quit']:
@@ -119,5 +186,8 @@ class StreamingCLI:
                 
             except KeyboardInterrupt:
                 console.print("\n[yellow]Use /exit to quit[/yellow]")
+            except EOFError:
+                console.print("\n[yellow]Goodbye! 👋[/yellow]")
+                break
             except Exception as e:
                 console.print(f"[red]Error: {e}[/red]")
\ No newline at end of file
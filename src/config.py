@@ -1,8 +1,9 @@
 """
 Configuration management for the Planning Assistant
 """
+import functools
 import os
-from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
@@ -10,73 +11,98 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Environment snapshot; it doesn't change after load_dotenv, so Config
+# defaults are resolved once at import instead of per instance
+_ENV = MappingProxyType(dict(os.environ))
+_DEBUG = _ENV.get("DEBUG", "False").lower() == "true"
+
+# Directories already created or found by ensure_directories in this process
+_ENSURED_DIRECTORIES: set = set()
+
 
 class Config(BaseModel):
     """Application configuration"""
     
     # OpenAI settings
-    openai_api_key: str = Field(default_factory=lambda: os.getenv("OPENAI_API_KEY", ""))
-    openai_model: str = Field(default_factory=lambda: os.getenv("OPENAI_MODEL", "gpt-4o"))
+    openai_api_key: str = Field(default=_ENV.get("OPENAI_API_KEY", ""))
+    openai_model: str = Field(default=_ENV.get("OPENAI_MODEL", "gpt-4o"))
     
     # Todoist settings
-    todoist_api_key: str = Field(default_factory=lambda: os.getenv("TODOIST_API_KEY", ""))
+    todoist_api_key: str = Field(default=_ENV.get("TODOIST_API_KEY", ""))
     
     # Google/Gmail settings
-    google_client_id: str = Field(default_factory=lambda: os.getenv("GOOGLE_CLIENT_ID", ""))
-    google_client_secret: str = Field(default_factory=lambda: os.getenv("GOOGLE_CLIENT_SECRET", ""))
-    google_redirect_uri: str = Field(default_factory=lambda: os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:8080"))
+    google_client_id: str = Field(default=_ENV.get("GOOGLE_CLIENT_ID", ""))
+    google_client_secret: str = Field(default=_ENV.get("GOOGLE_CLIENT_SECRET", ""))
+    google_redirect_uri: str = Field(default=_ENV.get("GOOGLE_REDIRECT_URI", "http://localhost:8080"))
     
     # Application settings
-    debug: bool = Field(default_factory=lambda: os.getenv("DEBUG", "False").lower() == "true")
-    log_level: str = Field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
-    session_db_path: str = Field(default_factory=lambda: os.getenv("SESSION_DB_PATH", "data/sessions.db"))
+    debug: bool = Field(default=_DEBUG)
+    log_level: str = Field(default=_ENV.get("LOG_LEVEL", "INFO"))
+    session_db_path: str = Field(default=_ENV.get("SESSION_DB_PATH", "data/sessions.db"))
     
     # SpaCy settings
-    spacy_model: str = Field(default_factory=lambda: os.getenv("SPACY_MODEL", "en_core_web_lg"))
+    spacy_model: str = Field(default=_ENV.get("SPACY_MODEL", "en_core_web_lg"))
     
     # Timezone settings
-    default_timezone: str = Field(default_factory=lambda: os.getenv("DEFAULT_TIMEZONE", "UTC"))
+    default_timezone: str = Field(default=_ENV.get("DEFAULT_TIMEZONE", "UTC"))
     
     # Agent settings
     max_agent_turns: int = Field(default=10, description="Maximum turns for agent execution")
     agent_temperature: float = Field(default=0.7, description="Temperature for agent responses")
     enable_tracing: bool = Field(default=True, description="Enable OpenAI tracing")
+    max_handoff_history: int = Field(default=10_000, ge=1, description="Maximum handoff records kept for analytics")
     
     def validate_config(self) -> bool:
         """Validate that required configuration is present"""
-        errors = []
+        errors: list[str] = []
+        warnings: list[str] = []
         
         if not self.openai_api_key:
             errors.append("OPENAI_API_KEY is required")
             
         if self.todoist_api_key == "":
-            errors.append("Warning: TODOIST_API_KEY not configured")
+            warnings.append("TODOIST_API_KEY not configured")
             
         if self.google_client_id == "":
-            errors.append("Warning: Google/Gmail integration not configured")
+            warnings.append("Google/Gmail integration not configured")
             
-        if errors:
-            for error in errors:
-                print(f"Configuration: {error}")
-            return not any("required" in e for e in errors)
+        for error in errors:
+            print(f"Configuration: {error}")
+        for warning in warnings:
+            print(f"Configuration: Warning: {warning}")
             
-        return True
+        return not errors
     
     def ensure_directories(self):
         """Ensure required directories exist"""
-        # Create data directory for sessions database
-        db_path = Path(self.session_db_path)
-        db_path.parent.mkdir(parents=True, exist_ok=True)
+        directories = (
+            # Data directory for sessions database
+            os.path.dirname(self.session_db_path),
+            # Logs directory
+            "logs",
+            # Credentials directory for OAuth tokens
+            "credentials",
+        )
         
-        # Create logs directory
-        Path("logs").mkdir(exist_ok=True)
-        
-        # Create credentials directory for OAuth tokens
-        Path("credentials").mkdir(exist_ok=True)
+        for directory in directories:
+            if not directory or directory in _ENSURED_DIRECTORIES:
+                continue
+            # A stat is cheaper than mkdir's failure path for existing directories
+            if not os.path.isdir(directory):
+                os.makedirs(directory, exist_ok=True)
+            _ENSURED_DIRECTORIES.add(directory)
+
 
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Get the global config instance, creating it and its directories on first use"""
+    config = Config()
+    config.ensure_directories()
+    return config
 
-# Global config instance
-config = Config()
 
-# Ensure directories exist
-config.ensure_directories()
\ No newline at end of file
+def __getattr__(name: str):
+    # Keeps `from config import config` working without building it at import
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,9 +1,12 @@
 """
 Input validation guardrails for the planning assistant
 """
+import asyncio
+import re
 from typing import List
 from agents import Agent, Runner, InputGuardrail, GuardrailFunctionOutput
 from pydantic import BaseModel
+from .verdict_cache import VerdictCache
 
 
 class SafetyCheckOutput(BaseModel):
@@ -22,65 +25,92 @@ class PlanningRequestValidation(BaseModel):
     reasoning: str
 
 
+class InputValidationOutput(BaseModel):
+    """Combined output from the safety and planning checks"""
+    safety: SafetyCheckOutput
+    planning: PlanningRequestValidation
+
+
+# Local prefilters: short inputs with no risky markers skip the safety LLM call,
+# and inputs that clearly mention a planning domain skip request validation
+_SAFETY_PREFILTER_MAX_LEN = 200
+_SAFETY_RE = re.compile(
+    r"ignore\s+(?:all\s+|any\s+)?(?:previous|prior|above)\s+instructions"
+    r"|system\s+prompt|jailbreak|pretend\s+to\s+be|impersonat"
+    r"|fake|pose\s+as|posing\s+as|as\s+if\s+(?:it\s+)?(?:was\s+|were\s+|came\s+)?from|on\s+behalf\s+of|spoof|\bforge[dr]?\b"
+    r"|password|passwd|api[\s_-]?key|secret|token|credential"
+    r"|credit\s+card|social\s+security|\bssn\b|\b\d{3}-\d{2}-\d{4}\b|\b(?:\d[\s-]?){13,16}\b"
+    r"|someone\s+else|without\s+(?:them|him|her)\s+knowing|unauthori[sz]ed|\bspy|stalk"
+    r"|kill|attack|threat|harass|abuse|spam|phish|hack|exploit|malware|bypass"
+    r"|\b(?:all|every|each)\s+(?:\d[\d,]*\s+|(?:one\s+)?of\s+(?:my|the|our|their)\s+)?(?:contacts|recipients|addresses|subscribers|users|employees|customers)"
+    r"|\b\d[\d,]{2,}\s+(?:\w+\s+)?(?:e-?mails|messages|contacts|invites|invitations|recipients|people|addresses)"
+    r"|\bmass\s+(?:e-?mail|mail|send|invite)|\bbulk\b|\bblast\b"
+    r"|<\s*script|https?://",
+    re.I
+)
+_PLANNING_RE = re.compile(
+    r"\b(?:(calendar|meeting|schedul|appointment)|(task|todo|to-do|remind)|(e-?mail|inbox))",
+    re.I
+)
+_PLANNING_TYPES = ("calendar", "task", "email")
+
+# Verdicts from the validator agents, reused for repeated inputs
+_SAFETY_CACHE: VerdictCache[SafetyCheckOutput] = VerdictCache()
+_PLANNING_CACHE: VerdictCache[PlanningRequestValidation] = VerdictCache()
+
+
 # Safety validation agent
 safety_agent = Agent(
     name="Safety Validator",
-    instructions="""You are a safety validator for a planning assistant.
-    
-    Evaluate user input for:
-    - Inappropriate or harmful content
-    - Requests to create misleading or fraudulent calendar events
-    - Attempts to manipulate or spam email/task systems
-    - Privacy violations or sensitive data exposure
-    - Malicious automation attempts
-    
-    Mark as unsafe if the request:
-    - Contains personal attacks, harassment, or threats
-    - Attempts to create fake meetings or impersonate others
-    - Tries to access unauthorized data or systems
-    - Contains spam or malicious content
-    - Violates basic privacy or security principles
-    
-    Most legitimate planning requests should be safe.""",
+    instructions="""Classify user input to a planning assistant for safety.
+    Unsafe: harassment or threats, fake meetings or impersonation, spam or
+    malicious automation, attempts to reach unauthorized data or systems,
+    privacy violations. Ordinary planning requests are safe.
+    Fill only the structured fields; keep reasoning to one sentence.""",
     output_type=SafetyCheckOutput,
-    model="gpt-4o"
+    model="gpt-4o-mini"
 )
 
 # Planning request validation agent
 planning_agent = Agent(
     name="Planning Request Validator", 
-    instructions="""You are a request validator for a planning assistant.
-    
-    Determine if the user input is a valid planning-related request:
-    
-    VALID request types:
-    - "calendar": Scheduling, viewing, or managing calendar events
-    - "task": Creating, updating, or managing tasks/todos
-    - "email": Reading, processing, or managing emails
-    - "general": General planning advice or coordination
-    
-    INVALID requests:
-    - Off-topic conversations unrelated to planning
-    - Requests for information outside the planning domain
-    - Technical support or general assistance requests
-    - Attempts to use the system for non-planning purposes
-    
-    Be helpful but focused on the planning assistant's purpose.""",
+    instructions="""Classify whether user input is a planning request.
+    request_type: "calendar" (events), "task" (todos), "email" (inbox),
+    "general" (planning advice or coordination), or "invalid" (off-topic,
+    general assistance, or non-planning use of the system).
+    Fill only the structured fields; keep reasoning to one sentence.""",
     output_type=PlanningRequestValidation,
-    model="gpt-4o"
+    model="gpt-4o-mini"
 )
 
 
 async def safety_guardrail(ctx, agent, input_data: str):
     """Validate input for safety and appropriateness"""
-    try:
-        result = await Runner.run(
-            safety_agent, 
-            f"Evaluate this user input for safety: {input_data}",
-            max_turns=1
+    if (
+        isinstance(input_data, str)
+        and len(input_data) < _SAFETY_PREFILTER_MAX_LEN
+        and not _SAFETY_RE.search(input_data)
+    ):
+        return GuardrailFunctionOutput(
+            output_info=SafetyCheckOutput(
+                is_safe=True,
+                risk_level="low",
+                concerns=[],
+                reasoning="prefilter pass"
+            ),
+            tripwire_triggered=False
         )
-        
-        safety_output = result.final_output_as(SafetyCheckOutput)
+
+    try:
+        safety_output = _SAFETY_CACHE.get(input_data)
+        if safety_output is None:
+            result = await Runner.run(
+                safety_agent,
+                f"Evaluate this user input for safety: {input_data}",
+                max_turns=1
+            )
+            safety_output = result.final_output_as(SafetyCheckOutput)
+            _SAFETY_CACHE.put(input_data, safety_output)
         
         return GuardrailFunctionOutput(
             output_info=safety_output,
@@ -102,14 +132,28 @@ async def safety_guardrail(ctx, agent, input_data: str):
 
 async def planning_request_guardrail(ctx, agent, input_data: str):
     """Validate that input is a legitimate planning request"""
-    try:
-        result = await Runner.run(
-            planning_agent,
-            f"Validate this planning request: {input_data}",
-            max_turns=1
+    match = _PLANNING_RE.search(input_data) if isinstance(input_data, str) else None
+    if match:
+        return GuardrailFunctionOutput(
+            output_info=PlanningRequestValidation(
+                is_valid_planning_request=True,
+                request_type=_PLANNING_TYPES[match.lastindex - 1],
+                confidence=1.0,
+                reasoning="prefilter pass"
+            ),
+            tripwire_triggered=False
         )
-        
-        validation_output = result.final_output_as(PlanningRequestValidation)
+
+    try:
+        validation_output = _PLANNING_CACHE.get(input_data)
+        if validation_output is None:
+            result = await Runner.run(
+                planning_agent,
+                f"Validate this planning request: {input_data}",
+                max_turns=1
+            )
+            validation_output = result.final_output_as(PlanningRequestValidation)
+            _PLANNING_CACHE.put(input_data, validation_output)
         
         # Only trigger tripwire for clearly invalid requests with high confidence
         should_block = (
@@ -136,15 +180,28 @@ async def planning_request_guardrail(ctx, agent, input_data: str):
         )
 
 
+async def combined_input_guardrail(ctx, agent, input_data: str):
+    """Run the safety and planning checks concurrently as a single guardrail"""
+    # Each check handles its own failures (safety fails safe, planning fails open)
+    safety, planning = await asyncio.gather(
+        safety_guardrail(ctx, agent, input_data),
+        planning_request_guardrail(ctx, agent, input_data)
+    )
+
+    return GuardrailFunctionOutput(
+        output_info=InputValidationOutput(
+            safety=safety.output_info,
+            planning=planning.output_info
+        ),
+        tripwire_triggered=safety.tripwire_triggered or planning.tripwire_triggered
+    )
+
+
 def create_input_guardrails() -> List[InputGuardrail]:
     """Create list of input guardrails for the planning assistant"""
     return [
         InputGuardrail(
-            name="safety_check",
-            guardrail_function=safety_guardrail
-        ),
-        InputGuardrail(
-            name="planning_validation", 
-            guardrail_function=planning_request_guardrail
+            name="combined_input",
+            guardrail_function=combined_input_guardrail
         )
-    ]
\ No newline at end of file
+    ]
@@ -1,9 +1,15 @@
 """
 Output safety guardrails for the planning assistant
 """
+import asyncio
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
 from typing import List
 from agents import Agent, Runner, OutputGuardrail, GuardrailFunctionOutput
 from pydantic import BaseModel
+from .verdict_cache import VerdictCache
 
 
 class OutputSafetyCheck(BaseModel):
@@ -25,61 +31,56 @@ class ResponseQualityCheck(BaseModel):
     reasoning: str
 
 
+# Verdicts from the validator agents, reused for repeated responses
+_SAFETY_CACHE: VerdictCache[OutputSafetyCheck] = VerdictCache()
+_QUALITY_CACHE: VerdictCache[ResponseQualityCheck] = VerdictCache()
+
+# Low-quality responses found by the background review, for offline analysis
+_QUALITY_LOG = Path("logs") / "quality.jsonl"
+
+# Background quality reviews still running; held so they aren't garbage collected
+_quality_reviews: set = set()
+
+logger = logging.getLogger(__name__)
+
+
 # Output safety validation agent
 output_safety_agent = Agent(
     name="Output Safety Validator",
-    instructions="""You are validating assistant responses for safety and appropriateness.
-    
-    Check for:
-    - Exposure of sensitive personal information (emails, phone numbers, private details)
-    - Inappropriate or harmful content in responses
-    - Misleading or incorrect information about calendar events or tasks
-    - Responses that could enable harmful automation
-    - Privacy violations in shared calendar/task information
-    
-    Mark as unsafe if the response:
-    - Contains or exposes personal/private information inappropriately
-    - Provides misleading scheduling or task information
-    - Could enable spam, harassment, or misuse
-    - Contains inappropriate content or recommendations
-    
-    Most helpful planning responses should be safe.""",
+    instructions="""Classify a planning assistant response for safety.
+    Unsafe: inappropriate content, misleading event or task details, or
+    help with spam, harassment or misuse. contains_sensitive_data: exposes
+    private details such as others' emails or phone numbers inappropriately.
+    Fill only the structured fields; keep reasoning to one sentence.""",
     output_type=OutputSafetyCheck,
-    model="gpt-4o"
+    model="gpt-4o-mini"
 )
 
 # Response quality validation agent  
 quality_agent = Agent(
     name="Response Quality Validator",
-    instructions="""You are evaluating the quality of planning assistant responses.
-    
-    A good planning response should be:
-    - Relevant to calendar, task, or email management
-    - Actionable with clear next steps
-    - Clear and easy to understand
-    - Helpful for the user's planning needs
-    
-    Rate quality based on:
-    - Relevance to planning domain (0.3 weight)
-    - Actionability and usefulness (0.4 weight) 
-    - Clarity and coherence (0.3 weight)
-    
-    Provide specific suggestions for improvement when quality is low.""",
+    instructions="""Score a planning assistant response from 0.0 to 1.0.
+    quality_score weights: relevance to calendar/task/email planning 0.3,
+    actionability 0.4, clarity 0.3.
+    Give suggestions only when quality is low.
+    Fill only the structured fields; keep reasoning to one sentence.""",
     output_type=ResponseQualityCheck,
-    model="gpt-4o"
+    model="gpt-4o-mini"
 )
 
 
 async def output_safety_guardrail(ctx, agent, output_data: str):
     """Validate output for safety and privacy"""
     try:
-        result = await Runner.run(
-            output_safety_agent,
-            f"Evaluate this assistant response for safety: {output_data}",
-            max_turns=1
-        )
-        
-        safety_output = result.final_output_as(OutputSafetyCheck)
+        safety_output = _SAFETY_CACHE.get(output_data)
+        if safety_output is None:
+            result = await Runner.run(
+                output_safety_agent,
+                f"Evaluate this assistant response for safety: {output_data}",
+                max_turns=1
+            )
+            safety_output = result.final_output_as(OutputSafetyCheck)
+            _SAFETY_CACHE.put(output_data, safety_output)
         
         # Block if unsafe or contains sensitive data
         should_block = not safety_output.is_safe or safety_output.contains_sensitive_data
@@ -106,13 +107,15 @@ async def output_safety_guardrail(ctx, agent, output_data: str):
 async def response_quality_guardrail(ctx, agent, output_data: str):
     """Validate response quality and relevance"""
     try:
-        result = await Runner.run(
-            quality_agent,
-            f"Evaluate this planning assistant response quality: {output_data}",
-            max_turns=1
-        )
-        
-        quality_output = result.final_output_as(ResponseQualityCheck)
+        quality_output = _QUALITY_CACHE.get(output_data)
+        if quality_output is None:
+            result = await Runner.run(
+                quality_agent,
+                f"Evaluate this planning assistant response quality: {output_data}",
+                max_turns=1
+            )
+            quality_output = result.final_output_as(ResponseQualityCheck)
+            _QUALITY_CACHE.put(output_data, quality_output)
         
         # Only flag for very low quality responses
         should_flag = quality_output.quality_score < 0.3
@@ -137,6 +140,42 @@ async def response_quality_guardrail(ctx, agent, output_data: str):
         )
 
 
+def _append_quality_record(record: dict):
+    """Append one review record to the quality log"""
+    _QUALITY_LOG.parent.mkdir(exist_ok=True)
+    with open(_QUALITY_LOG, 'a') as f:
+        f.write(json.dumps(record, default=str) + "\n")
+
+
+async def _background_quality_log(output_data: str):
+    """Score a response off the critical path and log it if quality is low"""
+    result = await response_quality_guardrail(None, None, output_data)
+    if not result.tripwire_triggered:
+        return
+
+    record = {
+        "timestamp": datetime.now().isoformat(),
+        **result.output_info.model_dump(),
+        "response": output_data
+    }
+    try:
+        await asyncio.to_thread(_append_quality_record, record)
+    except Exception as e:
+        logger.error(f"Failed to log response quality: {e}")
+
+
+async def quality_review_guardrail(ctx, agent, output_data: str):
+    """Schedule an advisory quality review without holding back the response"""
+    task = asyncio.create_task(_background_quality_log(output_data))
+    _quality_reviews.add(task)
+    task.add_done_callback(_quality_reviews.discard)
+
+    return GuardrailFunctionOutput(
+        output_info=None,
+        tripwire_triggered=False
+    )
+
+
 def create_output_guardrails() -> List[OutputGuardrail]:
     """Create list of output guardrails for the planning assistant"""
     return [
@@ -144,8 +183,9 @@ def create_output_guardrails() -> List[OutputGuardrail]:
             name="output_safety",
             guardrail_function=output_safety_guardrail
         ),
+        # Quality is advisory: it is reviewed in the background and never blocks
         OutputGuardrail(
             name="response_quality",
-            guardrail_function=response_quality_guardrail
+            guardrail_function=quality_review_guardrail
         )
-    ]
\ No newline at end of file
+    ]
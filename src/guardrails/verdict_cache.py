@@ -0,0 +1,48 @@
+"""
+Bounded cache of guardrail verdicts keyed by a hash of the checked text
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class VerdictCache(Generic[T]):
+    """LRU cache so identical inputs or outputs don't repeat a validator LLM call"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, T]" = OrderedDict()
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.blake2b(text.strip().lower().encode(), digest_size=16).hexdigest()
+
+    def get(self, text) -> Optional[T]:
+        """Return the cached verdict for text, or None on a miss"""
+        if not isinstance(text, str):
+            return None
+
+        key = self._key(text)
+        verdict = self._entries.get(key)
+        if verdict is not None:
+            self._entries.move_to_end(key)
+        return verdict
+
+    def put(self, text, verdict: T) -> None:
+        """Store a verdict, evicting the least recently used entry when full"""
+        if not isinstance(text, str):
+            return
+
+        key = self._key(text)
+        self._entries[key] = verdict
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,7 +1,8 @@
-from gmail_oauth import GmailAuthManager
+from gmail_oauth import GmailAuthManager, get_gmail_manager
 from service_status import ServiceStatusManager
 
 __all__ = [
     'GmailAuthManager',
+    'get_gmail_manager',
     'ServiceStatusManager'
 ]
\ No newline at end of file
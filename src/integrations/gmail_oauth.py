@@ -2,20 +2,207 @@
 Gmail OAuth authentication and API management
 """
 import os
+import asyncio
 import json
 import pickle
-from typing import Optional, List, Dict, Any
+import tempfile
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+# The Google auth and discovery clients are imported where they are first
+# needed; HttpError is light and is caught throughout
 from googleapiclient.errors import HttpError
 import base64
 from email.mime.text import MIMEText
+from html.parser import HTMLParser
 from datetime import datetime, timedelta
 import re
 
+try:
+    # Optional: Hyperscan for scanning many emails for action phrases in one pass
+    import hyperscan
+except ImportError:  # pragma: no cover
+    hyperscan = None
+
+try:
+    # Optional: incremental JSON parsing for large full-format messages
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+
+# Common action patterns; each captures the requested action
+ACTION_PATTERNS = [
+    r'please\s+(.*?)(?:\.|$)',
+    r'can\s+you\s+(.*?)(?:\.|$)',
+    r'need\s+to\s+(.*?)(?:\.|$)',
+    r'remember\s+to\s+(.*?)(?:\.|$)',
+    r'don\'t\s+forget\s+to\s+(.*?)(?:\.|$)',
+    r'action\s+required:\s+(.*?)(?:\.|$)',
+    r'todo:\s+(.*?)(?:\.|$)',
+    r'deadline:\s+(.*?)(?:\.|$)',
+    r'due\s+(.*?)(?:\.|$)'
+]
+
+# Each pattern compiled once; they are matched separately, since one action
+# can be introduced by several overlapping phrases ("please remember to ...")
+_ACTION_REGEXES = [(pattern, re.compile(pattern, re.IGNORECASE)) for pattern in ACTION_PATTERNS]
+
+# Hyperscan database of the phrase each action pattern starts with, built on first use
+_ACTION_SCAN_DB = None
+
+
+def _action_scan_db():
+    """Compile the action lead-in phrases into a Hyperscan database once"""
+    global _ACTION_SCAN_DB
+    if _ACTION_SCAN_DB is None:
+        lead_ins = [pattern.split('(', 1)[0].encode() for pattern in ACTION_PATTERNS]
+        db = hyperscan.Database()
+        db.compile(
+            expressions=lead_ins,
+            ids=list(range(len(lead_ins))),
+            elements=len(lead_ins),
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(lead_ins)
+        )
+        _ACTION_SCAN_DB = db
+    return _ACTION_SCAN_DB
+
+
+def _texts_with_action_phrases(texts: List[str]) -> set:
+    """Return the indexes of texts containing an action lead-in phrase.
+    
+    All texts are scanned as one NUL-separated buffer; each match's end offset
+    is mapped back to its text through the table of separator offsets.
+    """
+    encoded = [text.encode('utf-8') for text in texts]
+    separator_ends = list(accumulate(len(chunk) + 1 for chunk in encoded))
+    found = set()
+    
+    def on_match(pattern_id, start, end, flags, context):
+        found.add(bisect_left(separator_ends, end))
+    
+    _action_scan_db().scan(b'\0'.join(encoded), match_event_handler=on_match)
+    return found
+
+
+# Modal auxiliaries that turn "you <verb>" into a request ("could you send ...")
+_REQUEST_MODALS = frozenset(('can', 'could', 'would', 'will'))
+
+
+def _spacy_action_phrases(doc) -> List[str]:
+    """Return the actions a parsed text asks for, from its sentence structure.
+    
+    A sentence counts as a request when its root is a base-form verb that is
+    either imperative (no subject: "Send the report") or addressed to the
+    reader with a modal ("Could you send the report?"). The action runs from
+    the root verb to the end of the sentence.
+    """
+    actions = []
+    for sent in doc.sents:
+        root = sent.root
+        if root.pos_ != 'VERB' or root.tag_ != 'VB':
+            continue
+        
+        subjects = [child for child in root.children if child.dep_ in ('nsubj', 'nsubjpass')]
+        if subjects:
+            modals = {child.lower_ for child in root.children if child.dep_ == 'aux'}
+            if subjects[0].lower_ != 'you' or not modals & _REQUEST_MODALS:
+                continue
+        
+        actions.append(doc[root.i:sent.end].text.strip().rstrip('.?!').strip())
+    return actions
+
+
+def _stream_message(content: bytes, wanted_headers) -> Tuple[Dict[str, Any], Optional[str], Optional[str]]:
+    """Pull what get_message_content reads out of a full-format message response.
+    
+    The response is parsed incrementally, so other part bodies are never built
+    into the message, and parsing stops at the first non-empty text/plain body.
+    Parts are visited in document order, as in _extract_message_body. Returns
+    the message (id, threadId, labelIds and payload headers) with the base64
+    plain and HTML body data.
+    """
+    message: Dict[str, Any] = {'labelIds': [], 'payload': {'headers': []}}
+    headers = message['payload']['headers']
+    best_plain = None
+    best_html = None
+    # Prefix and mimeType of each MIME node being parsed, outermost first
+    nodes: List[List[Optional[str]]] = []
+    
+    for prefix, event, value in ijson.parse(content):
+        if event == 'start_map':
+            if prefix == 'payload' or prefix.endswith('.parts.item'):
+                nodes.append([prefix, None])
+            elif prefix == 'payload.headers.item':
+                headers.append({})
+        elif event == 'end_map':
+            if nodes and prefix == nodes[-1][0]:
+                nodes.pop()
+            elif prefix == 'payload.headers.item' and headers[-1].get('name') not in wanted_headers:
+                headers.pop()
+        elif event != 'string':
+            continue
+        elif prefix in ('id', 'threadId'):
+            message[prefix] = value
+        elif prefix == 'labelIds.item':
+            message['labelIds'].append(value)
+        elif prefix in ('payload.headers.item.name', 'payload.headers.item.value'):
+            headers[-1][prefix.rsplit('.', 1)[1]] = value
+        elif nodes and prefix == nodes[-1][0] + '.mimeType':
+            nodes[-1][1] = value
+        elif nodes and prefix == nodes[-1][0] + '.body.data' and value:
+            if nodes[-1][1] == 'text/plain':
+                best_plain = value
+                break
+            if nodes[-1][1] == 'text/html' and best_html is None:
+                best_html = value
+    
+    return message, best_plain, best_html
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write a file through a temporary sibling and a rename, so readers never see it half-written"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _b64decode(data: str) -> str:
+    """Decode a base64url message part, tolerating missing padding and invalid UTF-8"""
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4)).decode('utf-8', 'replace')
+
+
+def _body_text(best_plain: Optional[str], best_html: Optional[str]) -> str:
+    """Decode the chosen body part: plain text if present, else the text of the HTML"""
+    if best_plain is not None:
+        return _b64decode(best_plain).strip()
+    if best_html is not None:
+        # Keep only the text content of the HTML
+        parser = _TextExtractor()
+        parser.feed(_b64decode(best_html))
+        parser.close()
+        return ''.join(parser.out).strip()
+    return ""
+
+
+class _TextExtractor(HTMLParser):
+    """Collects the text content of an HTML document in a single pass"""
+    
+    def __init__(self):
+        super().__init__()
+        self.out: List[str] = []
+    
+    def handle_data(self, data: str) -> None:
+        self.out.append(data)
+
 
 class GmailAuthManager:
     """Manages Gmail OAuth authentication and API operations"""
@@ -26,13 +213,38 @@ class GmailAuthManager:
         'https://www.googleapis.com/auth/gmail.modify'
     ]
     
+    METADATA_HEADERS = ['From', 'Subject', 'Date', 'To']
+    # Headers read from a message; any others in the payload are skipped
+    WANTED_HEADERS = frozenset(METADATA_HEADERS)
+    
+    # Full-format responses larger than this are parsed incrementally when ijson is installed
+    STREAM_PARSE_BYTES = 256 * 1024
+    
+    # Partial-response masks: the server returns only the fields list_messages reads
+    LIST_FIELDS = 'messages/id,nextPageToken'
+    METADATA_FIELDS = 'id,threadId,labelIds,snippet,payload/headers'
+    
+    # Messages fetched per batch HTTP request; Gmail may rate limit batches over 50
+    BATCH_SIZE = 50
+    
+    # Concurrent single gets when batching is unavailable, within Gmail's per-user quota
+    MAX_CONCURRENT_GETS = 10
+    
+    # Retries for rate-limited (429) and server error responses, with exponential backoff
+    MAX_RETRIES = 3
+    
     def __init__(self, config):
         self.config = config
         self.credentials_dir = Path("credentials")
         self.credentials_dir.mkdir(exist_ok=True)
-        self.token_file = self.credentials_dir / "gmail_token.pickle"
+        self.token_file = self.credentials_dir / "gmail_token.json"
+        # Token format written by earlier versions, migrated on first load
+        self.legacy_token_file = self.credentials_dir / "gmail_token.pickle"
         self.credentials_file = self.credentials_dir / "gmail_credentials.json"
         self._service = None
+        self._credentials = None
+        # Per-thread HTTP clients for requests executed off the event loop
+        self._local = threading.local()
         
     def setup_credentials_file(self) -> bool:
         """Create credentials file from environment variables"""
@@ -59,12 +271,24 @@ class GmailAuthManager:
     def authenticate(self) -> bool:
         """Authenticate with Gmail API"""
         try:
+            from google.auth.transport.requests import Request
+            from google.oauth2.credentials import Credentials
+            from google_auth_oauthlib.flow import InstalledAppFlow
+            from googleapiclient.discovery import build
+            
             creds = None
             
             # Load existing token
             if self.token_file.exists():
-                with open(self.token_file, 'rb') as token:
+                creds = Credentials.from_authorized_user_info(
+                    json.loads(self.token_file.read_text()), self.SCOPES
+                )
+            elif self.legacy_token_file.exists():
+                with open(self.legacy_token_file, 'rb') as token:
                     creds = pickle.load(token)
+                if creds:
+                    _atomic_write(self.token_file, creds.to_json().encode())
+                self.legacy_token_file.unlink()
             
             # If no valid credentials, get new ones
             if not creds or not creds.valid:
@@ -91,12 +315,17 @@ class GmailAuthManager:
                     # Run local server for OAuth callback
                     creds = flow.run_local_server(port=8080)
                 
-                # Save credentials for next run
-                with open(self.token_file, 'wb') as token:
-                    pickle.dump(creds, token)
+                # Save credentials for next run, off the calling (event loop) thread
+                threading.Thread(
+                    target=_atomic_write,
+                    args=(self.token_file, creds.to_json().encode()),
+                    name="gmail-token-writer"
+                ).start()
             
             # Build the service
-            self._service = build('gmail', 'v1', credentials=creds)
+            self._credentials = creds
+            # The discovery document bundled with the client is used; no HTTP fetch
+            self._service = build('gmail', 'v1', credentials=creds, static_discovery=True)
             return True
             
         except Exception as e:
@@ -128,22 +357,21 @@ class GmailAuthManager:
             results = self.service.users().messages().list(
                 userId='me', 
                 q=query, 
-                maxResults=max_results
+                maxResults=max_results,
+                fields=self.LIST_FIELDS
             ).execute()
             
             messages = results.get('messages', [])
+            details = await self._fetch_message_metadata([message['id'] for message in messages])
             
             email_list = []
+            wanted = self.WANTED_HEADERS
             for message in messages:
-                msg_detail = self.service.users().messages().get(
-                    userId='me', 
-                    id=message['id'],
-                    format='metadata',
-                    metadataHeaders=['From', 'Subject', 'Date', 'To']
-                ).execute()
+                msg_detail = details[message['id']]
                 
                 headers = msg_detail.get('payload', {}).get('headers', [])
-                header_dict = {h['name']: h['value'] for h in headers}
+                header_dict = {h['name']: h['value'] for h in headers if h['name'] in wanted}
+                labels = msg_detail.get('labelIds') or []
                 
                 email_info = {
                     "id": message['id'],
@@ -153,8 +381,8 @@ class GmailAuthManager:
                     "subject": header_dict.get('Subject', ''),
                     "date": header_dict.get('Date', ''),
                     "snippet": msg_detail.get('snippet', ''),
-                    "labels": msg_detail.get('labelIds', []),
-                    "is_unread": 'UNREAD' in msg_detail.get('labelIds', [])
+                    "labels": labels,
+                    "is_unread": 'UNREAD' in labels
                 }
                 
                 email_list.append(email_info)
@@ -178,24 +406,111 @@ class GmailAuthManager:
                 "message": f"Failed to list messages: {str(e)}"
             }
     
+    def _metadata_request(self, message_id: str):
+        """Build the metadata get request for one message"""
+        return self.service.users().messages().get(
+            userId='me',
+            id=message_id,
+            format='metadata',
+            metadataHeaders=self.METADATA_HEADERS,
+            fields=self.METADATA_FIELDS
+        )
+    
+    def _thread_http(self):
+        """HTTP client for the calling thread; httplib2 connections can't be shared across threads"""
+        if self._credentials is None:
+            return None
+        
+        cached = getattr(self._local, 'http', None)
+        if cached is None or cached[0] is not self._credentials:
+            import httplib2
+            from google_auth_httplib2 import AuthorizedHttp
+            
+            cached = (self._credentials, AuthorizedHttp(self._credentials, http=httplib2.Http()))
+            self._local.http = cached
+        return cached[1]
+    
+    def _get_message_metadata(self, message_id: str) -> Dict[str, Any]:
+        """Fetch metadata for one message; blocking, so run it in a worker thread"""
+        return self._metadata_request(message_id).execute(
+            http=self._thread_http(),
+            num_retries=self.MAX_RETRIES
+        )
+    
+    def _execute_batches(self, message_ids: List[str], callback):
+        """Fetch metadata with one batch HTTP request per BATCH_SIZE ids"""
+        for start in range(0, len(message_ids), self.BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=callback)
+            for message_id in message_ids[start:start + self.BATCH_SIZE]:
+                batch.add(self._metadata_request(message_id), request_id=message_id)
+            batch.execute(http=self._thread_http())
+    
+    async def _fetch_message_metadata(self, message_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch metadata for many messages, batched where the endpoint allows it"""
+        details = {}
+        errors = []
+        
+        def on_message(request_id, response, exception):
+            if exception is not None:
+                errors.append(exception)
+            else:
+                details[request_id] = response
+        
+        try:
+            await asyncio.to_thread(self._execute_batches, message_ids, on_message)
+        except HttpError:
+            # Batch endpoint unavailable; fetch whatever is missing with concurrent single gets
+            missing = [message_id for message_id in message_ids if message_id not in details]
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_GETS)
+            
+            async def fetch(message_id):
+                async with semaphore:
+                    return await asyncio.to_thread(self._get_message_metadata, message_id)
+            
+            results = await asyncio.gather(*(fetch(message_id) for message_id in missing))
+            details.update(zip(missing, results))
+            return details
+        
+        if errors:
+            raise errors[0]
+        return details
+    
     async def get_message_content(self, message_id: str) -> Dict[str, Any]:
         """Get full message content"""
         try:
             if not self.service:
                 return {"error": "Gmail not authenticated"}
             
-            message = self.service.users().messages().get(
+            request = self.service.users().messages().get(
                 userId='me', 
                 id=message_id,
                 format='full'
-            ).execute()
+            )
+            wanted = self.WANTED_HEADERS
+            # Base64 plain and HTML body data, when picked out while parsing
+            body_parts = None
+            
+            if ijson is not None:
+                # Keep the raw response so large messages can be parsed incrementally
+                request.postproc = lambda resp, content: content
+                content = request.execute()
+                if len(content) > self.STREAM_PARSE_BYTES:
+                    message, *body_parts = _stream_message(content, wanted)
+                else:
+                    message = json.loads(content)
+            else:
+                message = request.execute()
             
             # Extract headers
             headers = message.get('payload', {}).get('headers', [])
-            header_dict = {h['name']: h['value'] for h in headers}
+            header_dict = {h['name']: h['value'] for h in headers if h['name'] in wanted}
+            labels = message.get('labelIds') or []
             
             # Extract body
-            body = self._extract_message_body(message.get('payload', {}))
+            if body_parts is not None:
+                body = _body_text(*body_parts)
+            else:
+                body = self._extract_message_body(message.get('payload', {}))
             
             return {
                 "status": "success",
@@ -207,8 +522,8 @@ class GmailAuthManager:
                     "subject": header_dict.get('Subject', ''),
                     "date": header_dict.get('Date', ''),
                     "body": body,
-                    "labels": message.get('labelIds', []),
-                    "is_unread": 'UNREAD' in message.get('labelIds', [])
+                    "labels": labels,
+                    "is_unread": 'UNREAD' in labels
                 }
             }
             
@@ -220,59 +535,69 @@ class GmailAuthManager:
     
     def _extract_message_body(self, payload: Dict[str, Any]) -> str:
         """Extract text content from message payload"""
-        body = ""
+        # Walk the MIME tree depth-first in document order, including nested
+        # multiparts, and keep the first plain text part (or, failing that, the
+        # first HTML part); _stream_message picks parts in the same order
+        best_plain = None
+        best_html = None
+        stack = [payload]
         
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if part.get('mimeType') == 'text/plain':
-                    data = part.get('body', {}).get('data')
-                    if data:
-                        body += base64.urlsafe_b64decode(data).decode('utf-8')
-                elif part.get('mimeType') == 'text/html' and not body:
-                    # Fallback to HTML if no plain text
-                    data = part.get('body', {}).get('data')
-                    if data:
-                        html_content = base64.urlsafe_b64decode(data).decode('utf-8')
-                        # Basic HTML tag removal
-                        body += re.sub('<[^<]+?>', '', html_content)
-        else:
-            # Simple message structure
-            if payload.get('mimeType') == 'text/plain':
-                data = payload.get('body', {}).get('data')
-                if data:
-                    body = base64.urlsafe_b64decode(data).decode('utf-8')
+        while stack and best_plain is None:
+            node = stack.pop()
+            if node.get('parts'):
+                stack.extend(reversed(node['parts']))
+                continue
+            
+            data = node.get('body', {}).get('data')
+            if not data:
+                continue
+            mime_type = node.get('mimeType')
+            if mime_type == 'text/plain':
+                best_plain = data
+            elif mime_type == 'text/html' and best_html is None:
+                best_html = data
         
-        return body.strip()
+        return _body_text(best_plain, best_html)
     
     async def extract_action_items(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Extract potential action items from emails"""
+        from nlp.context_manager import loaded_spacy_model
+        
         action_items = []
+        texts = [f"{email.get('subject', '')} {email.get('snippet', '')}".lower() for email in emails]
+        
+        # Reuse the spaCy pipeline if one is already loaded; it catches requests
+        # the patterns miss, so every email is parsed
+        nlp = loaded_spacy_model()
+        docs = None
+        if nlp is not None and texts:
+            # The subject is its own sentence, so its verbs aren't parsed into the snippet's
+            sentences = [f"{email.get('subject', '')}. {email.get('snippet', '')}" for email in emails]
+            
+            def parse():
+                unused = [name for name in ('ner', 'lemmatizer') if name in nlp.pipe_names]
+                with nlp.select_pipes(disable=unused):
+                    return list(nlp.pipe(sentences, batch_size=64))
+            
+            docs = await asyncio.to_thread(parse)
         
-        # Common action patterns
-        action_patterns = [
-            r'please\s+(.*?)(?:\.|$)',
-            r'can\s+you\s+(.*?)(?:\.|$)', 
-            r'need\s+to\s+(.*?)(?:\.|$)',
-            r'remember\s+to\s+(.*?)(?:\.|$)',
-            r'don\'t\s+forget\s+to\s+(.*?)(?:\.|$)',
-            r'action\s+required:\s+(.*?)(?:\.|$)',
-            r'todo:\s+(.*?)(?:\.|$)',
-            r'deadline:\s+(.*?)(?:\.|$)',
-            r'due\s+(.*?)(?:\.|$)'
-        ]
+        # With Hyperscan, one scan over all emails finds those worth matching
+        candidates = None
+        if docs is None and hyperscan is not None and texts:
+            candidates = _texts_with_action_phrases(texts)
         
-        for email in emails:
+        for index, (email, text_to_search) in enumerate(zip(emails, texts)):
+            if candidates is not None and index not in candidates:
+                continue
+            
             email_id = email.get('id', '')
             subject = email.get('subject', '')
-            snippet = email.get('snippet', '')
             from_email = email.get('from', '')
             
             # Look for action patterns in subject and snippet
-            text_to_search = f"{subject} {snippet}".lower()
-            
-            for pattern in action_patterns:
-                matches = re.finditer(pattern, text_to_search, re.IGNORECASE)
-                for match in matches:
+            found = []
+            for pattern, regex in _ACTION_REGEXES:
+                for match in regex.finditer(text_to_search):
                     action_text = match.group(1).strip()
                     
                     if len(action_text) > 5:  # Filter out very short matches
@@ -284,6 +609,25 @@ class GmailAuthManager:
                             "priority": "medium",
                             "extracted_pattern": pattern
                         })
+                        found.append(action_text)
+            
+            if docs is None:
+                continue
+            for action_text in _spacy_action_phrases(docs[index]):
+                # Lowercased like the pattern matches, so the two compare equal
+                action_text = action_text.lower()
+                # Skip requests already extracted by a pattern
+                if len(action_text) <= 5 or any(action_text in seen or seen in action_text for seen in found):
+                    continue
+                action_items.append({
+                    "email_id": email_id,
+                    "from": from_email,
+                    "subject": subject,
+                    "action": action_text,
+                    "priority": "medium",
+                    "extracted_pattern": "spacy:request"
+                })
+                found.append(action_text)
         
         return action_items
     
@@ -309,4 +653,38 @@ class GmailAuthManager:
             return {
                 "status": "error",
                 "message": f"Failed to mark as read: {str(e)}"
-            }
\ No newline at end of file
+            }
+
+
+# Recently used managers, keyed by _manager_cache_key, so the token load and
+# service build happen once per config instead of once per caller
+_MANAGER_CACHE_SIZE = 4
+_manager_cache: "OrderedDict[Tuple, Tuple[Any, GmailAuthManager]]" = OrderedDict()
+
+
+def _manager_cache_key(config) -> Tuple:
+    """Identify a config instance and the OAuth settings the manager uses"""
+    return (
+        id(config),
+        config.google_client_id,
+        config.google_client_secret,
+        config.google_redirect_uri,
+    )
+
+
+def get_gmail_manager(config) -> GmailAuthManager:
+    """Get the shared GmailAuthManager for a config, with its authenticated service"""
+    key = _manager_cache_key(config)
+    cached = _manager_cache.get(key)
+    if cached is not None:
+        _manager_cache.move_to_end(key)
+        return cached[1]
+    
+    manager = GmailAuthManager(config)
+    
+    # Holding the config keeps its id from being reused while the entry lives
+    _manager_cache[key] = (config, manager)
+    if len(_manager_cache) > _MANAGER_CACHE_SIZE:
+        _manager_cache.popitem(last=False)
+    
+    return manager
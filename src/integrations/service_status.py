@@ -1,12 +1,18 @@
 """
 Service status monitoring for all integrations
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from datetime import datetime, timedelta
 from enum import Enum
 import asyncio
-import subprocess
+import importlib.util
+import threading
 
+try:
+    # Optional: in-process calendar access on macOS (pyobjc-framework-EventKit)
+    from EventKit import EKEventStore, EKEntityTypeEvent
+except ImportError:  # pragma: no cover
+    EKEventStore = None
 
 class ServiceStatus(str, Enum):
     CONNECTED = "connected"
@@ -16,6 +22,15 @@ class ServiceStatus(str, Enum):
     NOT_CONFIGURED = "not_configured"
 
 
+_STATUS_ICONS: Dict[ServiceStatus, str] = {
+    ServiceStatus.CONNECTED: "🟢",
+    ServiceStatus.DISCONNECTED: "🔴",
+    ServiceStatus.AUTHENTICATING: "🟡",
+    ServiceStatus.ERROR: "🔴",
+    ServiceStatus.NOT_CONFIGURED: "⚫"
+}
+
+
 class ServiceStatusManager:
     """Manages status monitoring for all service integrations"""
     
@@ -24,47 +39,75 @@ class ServiceStatusManager:
         self._last_checks = {}
         self._status_cache = {}
         self._check_interval = timedelta(minutes=5)
+        # EventKit store, kept once calendar access has been granted
+        self._event_store = None
     
     async def get_all_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all services"""
-        
-        services = {
-            "calendar": await self._check_calendar_status(),
-            "todoist": await self._check_todoist_status(), 
-            "gmail": await self._check_gmail_status(),
-            "nlp": await self._check_nlp_status()
+        checks = {
+            "calendar": self._check_calendar_status,
+            "todoist": self._check_todoist_status,
+            "gmail": self._check_gmail_status,
+            "nlp": self._check_nlp_status
         }
         
-        return services
+        # The checks are independent I/O, so run them concurrently
+        results = await asyncio.gather(
+            *(self._cached(name, check) for name, check in checks.items())
+        )
+        
+        return dict(zip(checks, results))
+    
+    async def _cached(self, name: str, check: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Run a status check, reusing its last result within the check interval"""
+        last_check = self._last_checks.get(name)
+        if last_check is not None and datetime.now() - last_check < self._check_interval:
+            return self._status_cache[name]
+        
+        status = await check()
+        self._status_cache[name] = status
+        self._last_checks[name] = datetime.now()
+        return status
     
     async def _check_calendar_status(self) -> Dict[str, Any]:
         """Check MacOS Calendar status"""
         try:
-            # Test if Calendar app is accessible
-            result = subprocess.run(
-                ['osascript', '-e', 'tell application "Calendar" to return (name of every calendar)'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0 and result.stdout.strip():
-                calendars = [cal.strip() for cal in result.stdout.strip().split(',') if cal.strip()]
-                return {
-                    "status": ServiceStatus.CONNECTED,
-                    "message": f"Found {len(calendars)} calendar(s)",
-                    "calendars": calendars,
-                    "last_check": datetime.now().isoformat()
-                }
-            else:
-                return {
-                    "status": ServiceStatus.ERROR,
-                    "message": "Could not access Calendar app",
-                    "error": result.stderr,
-                    "last_check": datetime.now().isoformat()
-                }
+            calendars = None
+            if EKEventStore is not None:
+                calendars = await asyncio.to_thread(self._eventkit_calendar_names)
+            
+            if not calendars:
+                # Test if Calendar app is accessible through AppleScript
+                proc = await asyncio.create_subprocess_exec(
+                    'osascript', '-e', 'tell application "Calendar" to return (name of every calendar)',
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                try:
+                    stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=10)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    raise
                 
-        except subprocess.TimeoutExpired:
+                output = stdout.decode().strip()
+                if proc.returncode != 0 or not output:
+                    return {
+                        "status": ServiceStatus.ERROR,
+                        "message": "Could not access Calendar app",
+                        "error": stderr.decode(),
+                        "last_check": datetime.now().isoformat()
+                    }
+                calendars = [cal.strip() for cal in output.split(',') if cal.strip()]
+            
+            return {
+                "status": ServiceStatus.CONNECTED,
+                "message": f"Found {len(calendars)} calendar(s)",
+                "calendars": calendars,
+                "last_check": datetime.now().isoformat()
+            }
+                
+        except asyncio.TimeoutError:
             return {
                 "status": ServiceStatus.ERROR,
                 "message": "Calendar check timed out",
@@ -77,6 +120,30 @@ class ServiceStatusManager:
                 "last_check": datetime.now().isoformat()
             }
     
+    def _eventkit_calendar_names(self) -> Optional[List[str]]:
+        """List calendar names in-process through EventKit; None if access isn't granted"""
+        if self._event_store is None:
+            store = EKEventStore.alloc().init()
+            
+            # Access is requested asynchronously; wait for the answer
+            answered = threading.Event()
+            access = {}
+            
+            def on_access(granted, error):
+                access["granted"] = bool(granted)
+                answered.set()
+            
+            store.requestAccessToEntityType_completion_(EKEntityTypeEvent, on_access)
+            answered.wait(10)
+            if not access.get("granted"):
+                return None
+            self._event_store = store
+        
+        return [
+            str(calendar.title())
+            for calendar in self._event_store.calendarsForEntityType_(EKEntityTypeEvent)
+        ]
+    
     async def _check_todoist_status(self) -> Dict[str, Any]:
         """Check Todoist API status"""
         if not self.config.todoist_api_key:
@@ -92,8 +159,8 @@ class ServiceStatusManager:
             api = TodoistAPI(self.config.todoist_api_key)
             
             # Test API connection by getting user info
-            user = api.get_current_user()
-            projects = api.get_projects()
+            user = await asyncio.to_thread(api.get_current_user)
+            projects = await asyncio.to_thread(api.get_projects)
             
             return {
                 "status": ServiceStatus.CONNECTED,
@@ -129,11 +196,13 @@ class ServiceStatusManager:
             }
         
         try:
-            from gmail_oauth import GmailAuthManager
+            from gmail_oauth import get_gmail_manager
             
-            auth_manager = GmailAuthManager(self.config)
+            # Shared manager, so the token and built service survive between checks
+            auth_manager = get_gmail_manager(self.config)
             
-            if auth_manager.is_authenticated():
+            # May load the token or run the OAuth flow, both blocking
+            if await asyncio.to_thread(auth_manager.is_authenticated):
                 # Try a simple API call to verify connection
                 result = await auth_manager.list_messages("", 1)
                 
@@ -168,52 +237,52 @@ class ServiceStatusManager:
     async def _check_nlp_status(self) -> Dict[str, Any]:
         """Check SpaCy NLP status"""
         try:
-            import spacy
+            if importlib.util.find_spec("spacy") is None:
+                return {
+                    "status": ServiceStatus.ERROR,
+                    "message": "SpaCy not installed",
+                    "suggestion": "Install SpaCy with: pip install spacy",
+                    "last_check": datetime.now().isoformat()
+                }
             
-            # Try to load the configured model
-            model_name = self.config.spacy_model
+            # Load through the NLP context manager's loader, so the planner
+            # shares one pipeline per model
+            from nlp.context_manager import _load_spacy_model
             
+            # Try to load the configured model; the loader falls back to en_core_web_sm
+            model_name = self.config.spacy_model
             try:
-                nlp = spacy.load(model_name)
-                
-                # Test with a simple sentence
-                doc = nlp("Schedule a meeting tomorrow at 2pm")
-                entities = [(ent.text, ent.label_) for ent in doc.ents]
-                
+                nlp = await asyncio.to_thread(_load_spacy_model, model_name)
+            except RuntimeError:
+                return {
+                    "status": ServiceStatus.ERROR,
+                    "message": "No SpaCy models found",
+                    "suggestion": "Install a SpaCy model with: python -m spacy download en_core_web_sm",
+                    "last_check": datetime.now().isoformat()
+                }
+            
+            loaded_name = f"{nlp.meta['lang']}_{nlp.meta['name']}"
+            if loaded_name != model_name:
                 return {
                     "status": ServiceStatus.CONNECTED,
-                    "message": f"SpaCy model '{model_name}' loaded successfully",
-                    "model": model_name,
-                    "test_entities": entities,
+                    "message": f"Using fallback model '{loaded_name}' (configured: {model_name})",
+                    "model": loaded_name,
+                    "suggestion": f"Install {model_name} with: python -m spacy download {model_name}",
                     "last_check": datetime.now().isoformat()
                 }
-                
-            except OSError:
-                # Model not found, try fallback
-                try:
-                    nlp = spacy.load("en_core_web_sm")
-                    return {
-                        "status": ServiceStatus.CONNECTED,
-                        "message": f"Using fallback model 'en_core_web_sm' (configured: {model_name})",
-                        "model": "en_core_web_sm",
-                        "suggestion": f"Install {model_name} with: python -m spacy download {model_name}",
-                        "last_check": datetime.now().isoformat()
-                    }
-                except OSError:
-                    return {
-                        "status": ServiceStatus.ERROR,
-                        "message": "No SpaCy models found",
-                        "suggestion": "Install a SpaCy model with: python -m spacy download en_core_web_sm",
-                        "last_check": datetime.now().isoformat()
-                    }
-                    
-        except ImportError:
+            
+            # Test with a simple sentence
+            doc = nlp("Schedule a meeting tomorrow at 2pm")
+            entities = [(ent.text, ent.label_) for ent in doc.ents]
+            
             return {
-                "status": ServiceStatus.ERROR,
-                "message": "SpaCy not installed",
-                "suggestion": "Install SpaCy with: pip install spacy",
+                "status": ServiceStatus.CONNECTED,
+                "message": f"SpaCy model '{model_name}' loaded successfully",
+                "model": model_name,
+                "test_entities": entities,
                 "last_check": datetime.now().isoformat()
             }
+            
         except Exception as e:
             return {
                 "status": ServiceStatus.ERROR,
@@ -223,22 +292,8 @@ class ServiceStatusManager:
     
     def get_status_summary(self, services: Dict[str, Dict[str, Any]]) -> str:
         """Generate a user-friendly status summary"""
-        
-        status_icons = {
-            ServiceStatus.CONNECTED: "🟢",
-            ServiceStatus.DISCONNECTED: "🔴", 
-            ServiceStatus.AUTHENTICATING: "🟡",
-            ServiceStatus.ERROR: "🔴",
-            ServiceStatus.NOT_CONFIGURED: "⚫"
-        }
-        
-        summary_lines = []
-        
-        for service_name, service_info in services.items():
-            status = service_info.get("status", ServiceStatus.ERROR)
-            icon = status_icons.get(status, "❓")
-            message = service_info.get("message", "Unknown status")
-            
-            summary_lines.append(f"{icon} {service_name.title()}: {message}")
-        
-        return "\n".join(summary_lines)
\ No newline at end of file
+        return "\n".join(
+            f"{_STATUS_ICONS.get(service_info.get('status', ServiceStatus.ERROR), '❓')} "
+            f"{service_name.title()}: {service_info.get('message', 'Unknown status')}"
+            for service_name, service_info in services.items()
+        )
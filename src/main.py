@@ -10,7 +10,7 @@ from typing import Optional
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import config
+from config import get_config
 from cli.interface import PlannerCLI
 from agent_modules import create_orchestrator_agent
 
@@ -23,7 +23,7 @@ def setup_logging():
 
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     logging.basicConfig(
-        level=getattr(logging, config.log_level),
+        level=getattr(logging, get_config().log_level),
         format=log_format,
         handlers=[
             logging.FileHandler(log_dir / "planner.log"),
@@ -40,6 +40,7 @@ def setup_logging():
 async def initialize_services():
     """Initialize all services and connections"""
     logger = logging.getLogger(__name__)
+    config = get_config()
     
     # Validate configuration
     if not config.validate_config():
@@ -1,21 +1,32 @@
-from .task import Task, TodoistTask, TaskPriority, TaskStatus
-from .event import CalendarEvent, EventRecurrence, EventReminder
-from .context import PlanningContext, EntityContext, UserPreferences
-from .tool_error import ToolError
-from .calendar_tool import CalendarOperation, CalendarResponse
+import importlib
 
-__all__ = [
-    'Task',
-    'TodoistTask', 
-    'TaskPriority',
-    'TaskStatus',
-    'CalendarEvent',
-    'EventRecurrence',
-    'EventReminder',
-    'PlanningContext',
-    'EntityContext',
-    'UserPreferences',
-    'ToolError',
-    'CalendarOperation',
-    'CalendarResponse',
-]
\ No newline at end of file
+# Submodule providing each public model; submodules are imported on first access
+_LAZY = {
+    'Task': '.task',
+    'TodoistTask': '.task',
+    'TaskPriority': '.task',
+    'TaskStatus': '.task',
+    'CalendarEvent': '.event',
+    'EventRecurrence': '.event',
+    'EventReminder': '.event',
+    'PlanningContext': '.context',
+    'EntityContext': '.context',
+    'UserPreferences': '.context',
+    'ToolError': '.tool_error',
+    'CalendarOperation': '.calendar_tool',
+    'CalendarResponse': '.calendar_tool',
+}
+
+__all__ = tuple(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
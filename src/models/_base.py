@@ -0,0 +1,9 @@
+"""
+Shared base class for the planner's data models
+"""
+from pydantic import BaseModel, ConfigDict
+
+
+class Model(BaseModel):
+    """Base for internal models; validators are built on first use, not at import"""
+    model_config = ConfigDict(defer_build=True)
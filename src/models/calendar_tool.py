@@ -1,7 +1,10 @@
 from __future__ import annotations
 from typing import Optional, Any, List, Dict
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Calendar payloads are validated once and never mutated afterwards
+_CALENDAR_MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True)
 
 
 class CalendarEventData(BaseModel):
@@ -13,7 +16,7 @@ class CalendarEventData(BaseModel):
     location: Optional[str] = Field(None, description="Event location")
     all_day: bool = Field(False, description="Is this an all-day event")
 
-    model_config = {"extra": "forbid"}
+    model_config = _CALENDAR_MODEL_CONFIG
 
 
 class CalendarOperation(BaseModel):
@@ -25,7 +28,7 @@ class CalendarOperation(BaseModel):
     end_date: Optional[datetime] = None
     event_id: Optional[str] = None
 
-    model_config = {"extra": "forbid"}
+    model_config = _CALENDAR_MODEL_CONFIG
 
 
 class CalendarResponse(BaseModel):
@@ -38,4 +41,4 @@ class CalendarResponse(BaseModel):
     total_free_slots: Optional[int] = None
     error: Optional[str] = None
 
-    model_config = {"extra": "forbid"}
+    model_config = _CALENDAR_MODEL_CONFIG
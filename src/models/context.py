@@ -3,11 +3,13 @@ Context models for managing agent state and extracted entities
 """
 from typing import Optional, List, Dict, Any, Set
 from datetime import datetime, date, time, timedelta
-from pydantic import BaseModel, Field
+from pydantic import Field
 import pytz
 
+from ._base import Model
 
-class ExtractedEntity(BaseModel):
+
+class ExtractedEntity(Model):
     """Entity extracted from natural language"""
     text: str = Field(..., description="Original text")
     label: str = Field(..., description="Entity type (PERSON, DATE, TIME, etc.)")
@@ -18,7 +20,7 @@ class ExtractedEntity(BaseModel):
         return hash((self.text, self.label))
 
 
-class TemporalReference(BaseModel):
+class TemporalReference(Model):
     """Temporal reference extracted from text"""
     original_text: str = Field(..., description="Original temporal expression")
     parsed_datetime: Optional[datetime] = Field(None, description="Parsed datetime")
@@ -29,7 +31,7 @@ class TemporalReference(BaseModel):
     recurrence_pattern: Optional[str] = Field(None, description="Recurrence pattern if applicable")
 
 
-class EntityContext(BaseModel):
+class EntityContext(Model):
     """Context from NLP entity extraction"""
     raw_text: str = Field(..., description="Original user input")
     entities: List[ExtractedEntity] = Field(default_factory=list, description="Extracted entities")
@@ -40,6 +42,24 @@ class EntityContext(BaseModel):
     intent: Optional[str] = Field(None, description="Detected user intent")
     sentiment: Optional[str] = Field(None, description="Message sentiment")
     
+    @classmethod
+    def from_trusted_dict(cls, data: Dict[str, Any]) -> "EntityContext":
+        """Rebuild from this model's own model_dump() output without validation.
+        
+        Only for data the application produced itself; external input goes
+        through model_validate.
+        """
+        data = dict(data)
+        data["entities"] = [
+            ExtractedEntity.model_construct(**entity) if isinstance(entity, dict) else entity
+            for entity in data.get("entities", ())
+        ]
+        data["temporal_refs"] = [
+            TemporalReference.model_construct(**ref) if isinstance(ref, dict) else ref
+            for ref in data.get("temporal_refs", ())
+        ]
+        return cls.model_construct(**data)
+    
     def get_entities_by_label(self, label: str) -> List[ExtractedEntity]:
         """Get all entities with a specific label"""
         return [e for e in self.entities if e.label == label]
@@ -71,7 +91,7 @@ class EntityContext(BaseModel):
         return " | ".join(parts) if parts else "No specific context extracted"
 
 
-class UserPreferences(BaseModel):
+class UserPreferences(Model):
     """User preferences for planning"""
     working_hours_start: time = Field(default=time(9, 0), description="Start of working hours")
     working_hours_end: time = Field(default=time(17, 0), description="End of working hours")
@@ -120,7 +140,7 @@ class UserPreferences(BaseModel):
             local_dt += timedelta(days=1)
 
 
-class PlanningContext(BaseModel):
+class PlanningContext(Model):
     """Overall planning context for the session"""
     session_id: str = Field(..., description="Unique session identifier")
     user_preferences: UserPreferences = Field(default_factory=UserPreferences, description="User preferences")
@@ -132,6 +152,20 @@ class PlanningContext(BaseModel):
     conversation_summary: Optional[str] = Field(None, description="Summary of conversation so far")
     last_sync_times: Dict[str, datetime] = Field(default_factory=dict, description="Last sync time per service")
     
+    @classmethod
+    def from_trusted_dict(cls, data: Dict[str, Any]) -> "PlanningContext":
+        """Rebuild from this model's own model_dump() output without validation.
+        
+        Only for data the application produced itself, such as saved session
+        state; external input goes through model_validate.
+        """
+        data = dict(data)
+        if isinstance(data.get("user_preferences"), dict):
+            data["user_preferences"] = UserPreferences.model_construct(**data["user_preferences"])
+        if isinstance(data.get("entity_context"), dict):
+            data["entity_context"] = EntityContext.from_trusted_dict(data["entity_context"])
+        return cls.model_construct(**data)
+    
     def add_pending_confirmation(self, action_type: str, details: Dict[str, Any]):
         """Add an action that needs user confirmation"""
         self.pending_confirmations.append({
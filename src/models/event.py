@@ -2,11 +2,13 @@
 Calendar event models for MacOS Calendar and general event management
 """
 from enum import Enum
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
-from pydantic import BaseModel, Field, field_validator
+from pydantic import Field, field_validator
 import pytz
 
+from ._base import Model
+
 
 class EventRecurrence(str, Enum):
     """Event recurrence patterns"""
@@ -20,7 +22,7 @@ class EventRecurrence(str, Enum):
     CUSTOM = "custom"
 
 
-class EventReminder(BaseModel):
+class EventReminder(Model):
     """Event reminder configuration"""
     minutes_before: int = Field(..., description="Minutes before event to remind")
     method: str = Field("alert", description="Reminder method (alert, email, etc.)")
@@ -37,7 +39,7 @@ class EventReminder(BaseModel):
             return f"{days} day{'s' if days > 1 else ''} before"
 
 
-class CalendarEvent(BaseModel):
+class CalendarEvent(Model):
     """Calendar event model"""
     id: Optional[str] = None
     title: str = Field(..., description="Event title")
@@ -74,12 +76,24 @@ class CalendarEvent(BaseModel):
     @property
     def duration(self) -> timedelta:
         """Calculate event duration"""
-        return self.end_time - self.start_time
+        return self._cached_durations()[0]
     
     @property
     def duration_minutes(self) -> int:
         """Get duration in minutes"""
-        return int(self.duration.total_seconds() / 60)
+        return self._cached_durations()[1]
+    
+    def _cached_durations(self) -> Tuple[timedelta, int]:
+        """Duration and whole minutes, recomputed only when start_time or end_time is replaced"""
+        # Memoized in the instance __dict__ like a cached_property, so it stays out of
+        # fields, dumps and equality; the endpoint identity check catches assignments
+        # and model_copy(update=...)
+        cached = self.__dict__.get('_durations')
+        if cached is None or cached[0] is not self.start_time or cached[1] is not self.end_time:
+            duration = self.end_time - self.start_time
+            cached = (self.start_time, self.end_time, duration, int(duration.total_seconds() / 60))
+            self.__dict__['_durations'] = cached
+        return cached[2], cached[3]
     
     def to_natural_language(self) -> str:
         """Convert event to natural language description"""
@@ -2,11 +2,13 @@
 Task models for Todoist and general task management
 """
 from enum import Enum
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from datetime import datetime, date
-from pydantic import BaseModel, Field, field_validator
+from pydantic import Field, ValidationInfo, field_validator, model_validator
 import pytz
 
+from ._base import Model
+
 
 class TaskPriority(str, Enum):
     """Task priority levels"""
@@ -26,7 +28,36 @@ class TaskStatus(str, Enum):
     DEFERRED = "deferred"
 
 
-class Task(BaseModel):
+# Todoist API priority (4 = most urgent) to TaskPriority
+_PRIORITY_MAP = {
+    1: TaskPriority.LOW,
+    2: TaskPriority.MEDIUM,
+    3: TaskPriority.HIGH,
+    4: TaskPriority.URGENT,
+}
+
+# Todoist API task keys copied straight onto TodoistTask fields
+_TODOIST_FIELDS = {
+    "id": "todoist_id",
+    "content": "title",
+    "description": "description",
+    "labels": "labels",
+    "project_id": "todoist_project_id",
+    "section_id": "todoist_section_id",
+    "parent_id": "todoist_parent_id",
+    "order": "todoist_order",
+    "comment_count": "todoist_comment_count",
+    "is_completed": "todoist_is_completed",
+    "url": "todoist_url",
+    "assignee_id": "assignee_id",
+    "created_at": "created_at",
+}
+
+# Validation context marking input as a Todoist API task
+_TODOIST_CONTEXT = {"todoist": True}
+
+
+class Task(Model):
     """Generic task model"""
     id: Optional[str] = None
     title: str = Field(..., description="Task title/content")
@@ -107,37 +138,26 @@ class TodoistTask(Task):
             
         return payload
     
+    @model_validator(mode="before")
     @classmethod
-    def from_todoist_response(cls, data: Dict[str, Any]) -> "TodoistTask":
-        """Create from Todoist API response"""
-        priority_map = {
-            1: TaskPriority.LOW,
-            2: TaskPriority.MEDIUM,
-            3: TaskPriority.HIGH,
-            4: TaskPriority.URGENT,
-        }
+    def _map_todoist_fields(cls, data: Any, info: ValidationInfo) -> Any:
+        """Rename Todoist API task keys onto model fields when validating a response"""
+        if not (info.context and info.context.get("todoist")) or not isinstance(data, dict):
+            return data
         
-        due_date = None
-        if data.get("due"):
-            due_str = data["due"].get("datetime") or data["due"].get("date")
-            if due_str:
-                due_date = datetime.fromisoformat(due_str.replace("Z", "+00:00"))
+        fields = {field: data[key] for key, field in _TODOIST_FIELDS.items() if key in data}
+        fields.setdefault("title", "")
+        fields["priority"] = _PRIORITY_MAP.get(data.get("priority", 1), TaskPriority.NONE)
+        fields["status"] = TaskStatus.COMPLETED if data.get("is_completed") else TaskStatus.PENDING
         
-        return cls(
-            todoist_id=data.get("id"),
-            title=data.get("content", ""),
-            description=data.get("description"),
-            due_date=due_date,
-            priority=priority_map.get(data.get("priority", 1), TaskPriority.NONE),
-            status=TaskStatus.COMPLETED if data.get("is_completed") else TaskStatus.PENDING,
-            labels=data.get("labels", []),
-            todoist_project_id=data.get("project_id"),
-            todoist_section_id=data.get("section_id"),
-            todoist_parent_id=data.get("parent_id"),
-            todoist_order=data.get("order"),
-            todoist_comment_count=data.get("comment_count", 0),
-            todoist_is_completed=data.get("is_completed", False),
-            todoist_url=data.get("url"),
-            assignee_id=data.get("assignee_id"),
-            created_at=datetime.fromisoformat(data.get("created_at", datetime.now(pytz.UTC).isoformat())),
-        )
\ No newline at end of file
+        due = data.get("due")
+        if due:
+            fields["due_date"] = due.get("datetime") or due.get("date")
+        return fields
+    
+    @classmethod
+    def from_todoist_response(cls, data: Union[bytes, str, Dict[str, Any]]) -> "TodoistTask":
+        """Create from Todoist API response, either the raw JSON body or a parsed dict"""
+        if isinstance(data, (bytes, str)):
+            return cls.model_validate_json(data, context=_TODOIST_CONTEXT)
+        return cls.model_validate(data, context=_TODOIST_CONTEXT)
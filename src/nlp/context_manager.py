@@ -4,15 +4,21 @@ Advanced NLP Context Management System
 Provides sophisticated context tracking, entity resolution, and temporal
 understanding for multi-turn conversations in the Planning Assistant.
 """
-from typing import Dict, List, Any, Optional, Set, Tuple
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import defaultdict, deque
+from functools import lru_cache
 import re
 import json
-import spacy
-from spacy.tokens import Doc, Span, Token
+
+if TYPE_CHECKING:
+    # spaCy pulls in its model stack; it is imported when a model is first loaded
+    import spacy
+    from spacy.tokens import Doc, Span, Token
 
 from models.context import EntityContext, PlanningContext, UserPreferences
 
@@ -34,6 +40,35 @@ class ReferenceType(str, Enum):
     ENTITY_COREFERENCE = "coreference"  # Same entity, different mentions
 
 
+# Most recently loaded pipeline, for callers that reuse a model but never load one
+_loaded_nlp = None
+
+
+@lru_cache(maxsize=None)
+def _load_spacy_model(spacy_model: str) -> "spacy.language.Language":
+    """Load a SpaCy pipeline once per model name and share it across managers"""
+    global _loaded_nlp
+    import spacy
+    
+    # The lemmatizer output is never used, so skip running it
+    try:
+        nlp = spacy.load(spacy_model, disable=["lemmatizer"])
+    except OSError:
+        # Fallback to smaller model
+        try:
+            nlp = spacy.load("en_core_web_sm", disable=["lemmatizer"])
+        except OSError:
+            raise RuntimeError("No SpaCy model available. Please install with: python -m spacy download en_core_web_sm")
+    
+    _loaded_nlp = nlp
+    return nlp
+
+
+def loaded_spacy_model() -> Optional["spacy.language.Language"]:
+    """Return the pipeline last loaded by _load_spacy_model, or None if none has been loaded"""
+    return _loaded_nlp
+
+
 @dataclass
 class ContextualEntity:
     """Enhanced entity with contextual information"""
@@ -80,15 +115,8 @@ class AdvancedNLPContextManager:
     """Advanced context management system for NLP processing"""
     
     def __init__(self, spacy_model: str = "en_core_web_lg"):
-        # Load SpaCy model
-        try:
-            self.nlp = spacy.load(spacy_model)
-        except OSError:
-            # Fallback to smaller model
-            try:
-                self.nlp = spacy.load("en_core_web_sm")
-            except OSError:
-                raise RuntimeError("No SpaCy model available. Please install with: python -m spacy download en_core_web_sm")
+        # Load SpaCy model (shared between managers using the same model)
+        self.nlp = _load_spacy_model(spacy_model)
         
         # Conversation state
         self.turns: List[ConversationTurn] = []
@@ -106,6 +134,10 @@ class AdvancedNLPContextManager:
         self.entity_clusters: Dict[str, Set[str]] = defaultdict(set)
         self.canonical_entities: Dict[str, str] = {}
         
+        # Per-label coreference index: canonical_id -> (lowercased text, word set),
+        # kept in sync with session_entities so comparisons reuse precomputed keys
+        self._coreference_index: Dict[str, Dict[str, Tuple[str, frozenset]]] = defaultdict(dict)
+        
         # Recent context window (last N turns for active context)
         self.context_window_size = 5
         self.recent_entities = deque(maxlen=50)
@@ -115,17 +147,36 @@ class AdvancedNLPContextManager:
                     system_response: Optional[str] = None) -> ConversationTurn:
         """Process a complete conversation turn"""
         
+        # Process user input with NLP
+        return self._process_doc(self.nlp(user_input), system_response)
+    
+    def process_turns(self, 
+                      user_inputs: List[str], 
+                      batch_size: int = 32) -> List[ConversationTurn]:
+        """Process several consecutive conversation turns
+        
+        Parsing is batched through ``nlp.pipe``; context updates are still
+        applied turn by turn in order, so the result matches calling
+        ``process_turn`` for each input.
+        """
+        return [
+            self._process_doc(doc)
+            for doc in self.nlp.pipe(user_inputs, batch_size=batch_size)
+        ]
+    
+    def _process_doc(self, 
+                     doc: Doc, 
+                     system_response: Optional[str] = None) -> ConversationTurn:
+        """Apply a parsed user input to the conversation context"""
+        
         # Create new turn
         turn = ConversationTurn(
             turn_id=self.current_turn_id,
             timestamp=datetime.now(),
-            user_input=user_input,
+            user_input=doc.text,
             system_response=system_response
         )
         
-        # Process user input with NLP
-        doc = self.nlp(user_input)
-        
         # Extract and contextualize entities
         turn.entities = self._extract_contextual_entities(doc, turn)
         
@@ -133,7 +184,7 @@ class AdvancedNLPContextManager:
         self._resolve_references(turn)
         
         # Detect intent
-        turn.intent, turn.intent_confidence = self.intent_tracker.detect_intent(user_input, doc)
+        turn.intent, turn.intent_confidence = self.intent_tracker.detect_intent(doc.text, doc)
         
         # Update context
         self._update_context(turn)
@@ -284,10 +335,12 @@ class AdvancedNLPContextManager:
             entity.canonical_id = f"{entity.label}_{len(self.session_entities)}"
         
         # Check for coreference with existing entities
-        self._resolve_coreference(entity)
+        text_key = self._coreference_key(entity.text)
+        self._resolve_coreference(entity, text_key)
         
         # Add to session entities
         self.session_entities[entity.canonical_id] = entity
+        self._coreference_index[entity.label][entity.canonical_id] = text_key
         
         # Add to recent entities for context window
         self.recent_entities.append(entity)
@@ -295,40 +348,48 @@ class AdvancedNLPContextManager:
         # Update entity graph relationships
         self._update_entity_relationships(entity)
     
-    def _resolve_coreference(self, entity: ContextualEntity):
+    def _resolve_coreference(self, 
+                             entity: ContextualEntity, 
+                             text_key: Optional[Tuple[str, frozenset]] = None):
         """Resolve coreferences with existing entities"""
         
-        # Simple coreference resolution based on text similarity and proximity
-        for existing_id, existing_entity in self.session_entities.items():
-            
-            # Same text, different turns - likely same entity
-            if (entity.text.lower() == existing_entity.text.lower() and
-                entity.label == existing_entity.label):
-                entity.canonical_id = existing_id
-                existing_entity.aliases.add(entity.text)
-                return
+        text_lower, words = text_key or self._coreference_key(entity.text)
+        
+        # Simple coreference resolution based on text similarity and proximity.
+        # Only entities with the same label can corefer, so scan just that bucket.
+        for existing_id, (existing_lower, existing_words) in self._coreference_index[entity.label].items():
             
-            # Similar text for same entity type
-            if (entity.label == existing_entity.label and 
-                self._text_similarity(entity.text, existing_entity.text) > 0.8):
+            # Same text in a different turn, or similar text for the same type
+            if (text_lower == existing_lower or 
+                self._word_set_similarity(words, existing_words) > 0.8):
                 entity.canonical_id = existing_id
-                existing_entity.aliases.add(entity.text)
+                self.session_entities[existing_id].aliases.add(entity.text)
                 return
     
-    def _text_similarity(self, text1: str, text2: str) -> float:
-        """Calculate similarity between two text strings"""
-        # Simple Jaccard similarity
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-        
+    @staticmethod
+    def _coreference_key(text: str) -> Tuple[str, frozenset]:
+        """Precompute the lowercased text and word set used for coreference"""
+        text_lower = text.lower()
+        return text_lower, frozenset(text_lower.split())
+    
+    @staticmethod
+    def _word_set_similarity(words1: frozenset, words2: frozenset) -> float:
+        """Jaccard similarity between two precomputed word sets"""
         if not words1 or not words2:
             return 0.0
         
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
+        intersection = len(words1 & words2)
+        union = len(words1 | words2)
         
         return intersection / union if union > 0 else 0.0
     
+    def _text_similarity(self, text1: str, text2: str) -> float:
+        """Calculate similarity between two text strings"""
+        # Simple Jaccard similarity
+        return self._word_set_similarity(
+            self._coreference_key(text1)[1], self._coreference_key(text2)[1]
+        )
+    
     def _update_entity_relationships(self, entity: ContextualEntity):
         """Update relationships between entities"""
         
@@ -34,27 +34,27 @@ async def _manage_calendar_impl(operation_input: CalendarOperation) -> CalendarR
     try:
         if operation == "list":
             data = await list_events_structured(calendar_name, start_date, end_date)
-            return CalendarResponse(**data)
+            return CalendarResponse.model_validate(data)
         elif operation == "create":
             if not event_data:
                 return CalendarResponse(status="error", message="event_data required for create operation")
             data = await create_event_structured(calendar_name, event_data)
-            return CalendarResponse(**data)
+            return CalendarResponse.model_validate(data)
         elif operation == "update":
             if not event_id or not event_data:
                 return CalendarResponse(status="error", message="event_id and event_data required for update operation")
             data = await update_event_structured(event_id, event_data, calendar_name)
-            return CalendarResponse(**data)
+            return CalendarResponse.model_validate(data)
         elif operation == "delete":
             if not event_id:
                 return CalendarResponse(status="error", message="event_id required for delete operation")
             data = await delete_event_structured(event_id, calendar_name)
-            return CalendarResponse(**data)
+            return CalendarResponse.model_validate(data)
         elif operation == "find_free_slots":
             start = start_date or datetime.now()
             end = end_date or (start + timedelta(days=7))
             data = await find_free_slots_structured(start, end, calendar_name)
-            return CalendarResponse(**data)
+            return CalendarResponse.model_validate(data)
         else:
             return CalendarResponse(status="error", message=f"Unknown operation: {operation}")
     except Exception as e:
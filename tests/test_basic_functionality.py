@@ -82,6 +82,27 @@ class TestPydanticModels:
         assert "Test Task" in nl_description
         assert "Priority: p2" in nl_description
     
+    def test_todoist_task_from_response(self):
+        """Test TodoistTask parses a raw Todoist API task"""
+        from src.models.task import TodoistTask, TaskStatus
+        
+        raw = (
+            b'{"id": "123", "content": "Buy milk", "priority": 4, "is_completed": true,'
+            b' "labels": ["home"], "project_id": "p1", "comment_count": 2,'
+            b' "created_at": "2024-01-10T09:00:00Z", "due": {"date": "2024-01-15"}}'
+        )
+        
+        task = TodoistTask.from_todoist_response(raw)
+        
+        assert task.todoist_id == "123"
+        assert task.title == "Buy milk"
+        assert task.priority == TaskPriority.URGENT
+        assert task.status == TaskStatus.COMPLETED
+        assert task.todoist_project_id == "p1"
+        assert task.due_date.date().isoformat() == "2024-01-15"
+        assert task.due_date.tzinfo is not None
+        assert TodoistTask.from_todoist_response({"id": "123", "content": "Buy milk"}).priority == TaskPriority.LOW
+    
     def test_calendar_event_model(self):
         """Test CalendarEvent model creation and validation"""
         
@@ -99,6 +120,11 @@ class TestPydanticModels:
         assert event.duration_minutes == 60
         assert not event.all_day
         
+        # The memoized duration follows changes to the event's times
+        event.end_time = event.start_time + timedelta(minutes=90)
+        assert event.duration_minutes == 90
+        assert event.model_copy(update={"end_time": event.start_time + timedelta(hours=3)}).duration_minutes == 180
+        
         # Test natural language conversion
         nl_description = event.to_natural_language()
         assert "Test Meeting" in nl_description
@@ -127,6 +153,27 @@ class TestPydanticModels:
         summary = context.to_context_summary()
         assert "People: John" in summary
 
+    
+    def test_planning_context_from_trusted_dict(self):
+        """Test PlanningContext rebuilds its own dump without validation"""
+        from src.models.context import PlanningContext, ExtractedEntity
+        
+        context = PlanningContext(
+            session_id="session-1",
+            entity_context=EntityContext(
+                raw_text="Call John tomorrow",
+                entities=[ExtractedEntity(text="John", label="PERSON")],
+                temporal_refs=[TemporalReference(original_text="tomorrow", is_relative=True)]
+            )
+        )
+        context.add_pending_confirmation("create_event", {"title": "Call John"})
+        
+        restored = PlanningContext.from_trusted_dict(context.model_dump())
+        
+        assert restored == context
+        assert restored.entity_context.entities[0].label == "PERSON"
+        assert restored.to_agent_context() == context.to_agent_context()
+
 
 class TestIntegration:
     """Integration tests"""
@@ -192,6 +192,13 @@ async def test_handoff_coordinator():
     assert hasattr(coordinator, 'handoff_history')
 
 
+def test_handoff_tools_share_coordinator():
+    """Test handoff tools reuse one coordinator so analytics persist"""
+    from agent_modules.handoffs import _get_coordinator
+
+    assert _get_coordinator() is _get_coordinator()
+
+
 @pytest.mark.asyncio
 async def test_orchestrator_agent_creation():
     """Test that orchestrator agent can be created"""
@@ -223,6 +230,31 @@ async def test_orchestrator_agent_creation():
         assert len(main_agent_call) > 0
 
 
+@pytest.mark.asyncio
+async def test_orchestrator_agent_is_reused():
+    """Test repeated orchestrator creation with the same config reuses the agent graph"""
+    from config import Config
+    from agent_modules import create_orchestrator_agent
+
+    with patch('agent_modules.orchestrator.Agent') as MockAgent:
+        # A distinct mock per agent, so a rebuilt graph is a different object
+        MockAgent.side_effect = lambda *args, **kwargs: MagicMock()
+        config = Config()
+
+        first = await create_orchestrator_agent(config)
+        build_calls = MockAgent.call_count
+        second = await create_orchestrator_agent(config)
+
+        assert first is second
+        assert MockAgent.call_count == build_calls
+
+        # Changing a setting the agents depend on builds a new graph
+        config.openai_model = "gpt-4o-mini"
+        third = await create_orchestrator_agent(config)
+        assert third is not first
+        assert MockAgent.call_count == build_calls * 2
+
+
 @pytest.mark.asyncio
 async def test_cli_interface_import():
     """Test that CLI interface can be imported"""